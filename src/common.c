@@ -1,4 +1,28 @@
+#define _GNU_SOURCE
 #include "common.h"
+#include "rt_env.h"
+
+int keep_warmup_samples = 0;
+
+// CLOCK_MONOTONIC time at which the current test block started
+static unsigned long long block_start_ns;
+
+static unsigned long long monotonic_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (unsigned long long)ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+}
+
+static void __attribute__((constructor)) init_block_start(void) {
+    block_start_ns = monotonic_ns();
+}
+
+// start a new time window, e.g. after setup that should not count as a test
+void mark_block_start(void) {
+    block_start_ns = monotonic_ns();
+}
+
+static unsigned long long warmup_times[WARMUP_MAX_ITERATIONS];
 
 // calculate statistics
 void calculate_stats(unsigned long long *times, int n, stats_t *stats) {
@@ -40,9 +64,119 @@ void calculate_stats(unsigned long long *times, int n, stats_t *stats) {
     // calculate percentile
     stats->p95 = sorted[(int)(n * 0.95)];
     stats->p99 = sorted[(int)(n * 0.99)];
+    
+    stats->warmup_status = NULL;
+    stats->warmup_iterations = 0;
+    stats->warmup_samples = NULL;
+    
+    // histogram of all samples
+    memset(stats->hist, 0, sizeof(stats->hist));
+    for (int i = 0; i < n; i++) {
+        stats->hist[hist_bin(times[i])]++;
+    }
+    
+    // time series - avg and max per window, keeps the sample order
+    stats->series_window = n >= SERIES_POINTS ? n / SERIES_POINTS : 1;
+    stats->series_points = n / stats->series_window;
+    if (stats->series_points > SERIES_POINTS) stats->series_points = SERIES_POINTS;
+    for (int w = 0; w < stats->series_points; w++) {
+        unsigned long long window_sum = 0, window_max = 0;
+        for (int i = w * stats->series_window; i < (w + 1) * stats->series_window; i++) {
+            window_sum += times[i];
+            if (times[i] > window_max) window_max = times[i];
+        }
+        stats->series_avg[w] = window_sum / stats->series_window;
+        stats->series_max[w] = window_max;
+    }
+}
+
+// median of one warmup window
+static unsigned long long window_median(const unsigned long long *times) {
+    unsigned long long sorted[WARMUP_WINDOW];
+    memcpy(sorted, times, sizeof(sorted));
+    
+    // insertion sort, the window is small
+    for (int i = 1; i < WARMUP_WINDOW; i++) {
+        unsigned long long v = sorted[i];
+        int j = i - 1;
+        while (j >= 0 && sorted[j] > v) {
+            sorted[j + 1] = sorted[j];
+            j--;
+        }
+        sorted[j + 1] = v;
+    }
+    return sorted[WARMUP_WINDOW / 2];
+}
+
+// warm up with the measured kernel itself, then measure and report
+void run_benchmark(const char *test_name, bench_kernel_t kernel, void *ctx) {
+    unsigned long long times[ITERATIONS];
+    unsigned long long cold_first = 0, cold_max = 0;
+    unsigned long long cold_median = 0, prev_median = 0, median = 0;
+    int stable_windows = 0;
+    int n = 0;
+    
+    // adaptive warmup - windowed median until steady state or cap
+    while (n + WARMUP_WINDOW <= WARMUP_MAX_ITERATIONS) {
+        for (int k = 0; k < WARMUP_WINDOW; k++, n++) {
+            warmup_times[n] = kernel(n, ctx);
+        }
+        rt_env_check_signal();
+        median = window_median(&warmup_times[n - WARMUP_WINDOW]);
+        if (n == WARMUP_WINDOW) {
+            // the median hides first-touch outliers, so keep the extremes too
+            cold_first = warmup_times[0];
+            for (int k = 0; k < WARMUP_WINDOW; k++) {
+                if (warmup_times[k] > cold_max) cold_max = warmup_times[k];
+            }
+            cold_median = median;
+        } else if (fabs((double)median - (double)prev_median) <= WARMUP_TOLERANCE * (double)prev_median) {
+            stable_windows++;
+        } else {
+            stable_windows = 0;
+        }
+        prev_median = median;
+        
+        if (n >= WARMUP_ITERATIONS && stable_windows >= WARMUP_STABLE_WINDOWS) break;
+    }
+    
+    // main test - same kernel, iteration indices restart at 0
+    for (int i = 0; i < ITERATIONS; i++) {
+        times[i] = kernel(i, ctx);
+    }
+    
+    stats_t stats;
+    calculate_stats(times, ITERATIONS, &stats);
+    stats.warmup_status = stable_windows >= WARMUP_STABLE_WINDOWS ? "converged" : "capped";
+    stats.warmup_iterations = n;
+    stats.cold_first = cold_first;
+    stats.cold_max = cold_max;
+    stats.cold_median = cold_median;
+    stats.steady_median = median;
+    stats.warmup_samples = keep_warmup_samples ? warmup_times : NULL;
+    print_stats(test_name, &stats);
+}
+
+// log-linear bin index of a value
+int hist_bin(unsigned long long value) {
+    if (value < (1ULL << HIST_SUB_BITS)) return (int)value;
+    int msb = 63 - __builtin_clzll(value);
+    int shift = msb - HIST_SUB_BITS;
+    return ((shift + 1) << HIST_SUB_BITS) + (int)((value >> shift) & ((1 << HIST_SUB_BITS) - 1));
+}
+
+// smallest value that falls into a bin
+unsigned long long hist_bin_lower(int bin) {
+    if (bin < (1 << HIST_SUB_BITS)) return (unsigned long long)bin;
+    int shift = (bin >> HIST_SUB_BITS) - 1;
+    unsigned long long sub = bin & ((1 << HIST_SUB_BITS) - 1);
+    return ((1ULL << HIST_SUB_BITS) + sub) << shift;
 }
 
 void print_stats(const char *test_name, stats_t *stats) {
+    // this block covers everything since the previous one, warmup included
+    unsigned long long block_end_ns = monotonic_ns();
+    
     printf("=== %s ===\n", test_name);
     printf("  Min: %llu, Max: %llu, Avg: %llu\n", 
            stats->min, stats->max, stats->avg);
@@ -52,5 +186,36 @@ void print_stats(const char *test_name, stats_t *stats) {
            stats->p95, stats->p99);
     printf("  Coefficient of Variation: %.4f\n", 
            stats->std_dev / stats->avg);
+    
+    // non-empty bins as lower_bound:count
+    printf("  Histogram:");
+    for (int b = 0; b < HIST_BINS; b++) {
+        if (stats->hist[b]) printf(" %llu:%u", hist_bin_lower(b), stats->hist[b]);
+    }
+    printf("\n");
+    
+    // per-window avg/max
+    printf("  Series (window %d):", stats->series_window);
+    for (int w = 0; w < stats->series_points; w++) {
+        printf(" %llu/%llu", stats->series_avg[w], stats->series_max[w]);
+    }
+    printf("\n");
+    
+    if (stats->warmup_status) {
+        printf("  Warmup: %d iterations (%s), cold first %llu, cold max %llu, cold median %llu, steady median %llu\n",
+               stats->warmup_iterations, stats->warmup_status,
+               stats->cold_first, stats->cold_max,
+               stats->cold_median, stats->steady_median);
+    }
+    printf("  Time Window: %llu %llu\n", block_start_ns, block_end_ns);
+    block_start_ns = block_end_ns;
+    if (stats->warmup_samples) {
+        printf("  Warmup Samples:");
+        for (int i = 0; i < stats->warmup_iterations; i++) {
+            printf(" %llu", stats->warmup_samples[i]);
+        }
+        printf("\n");
+    }
     printf("\n");
+    rt_env_check_signal();
 }
@@ -10,7 +10,21 @@
 #include <time.h>
 
 #define ITERATIONS 2000
-#define WARMUP_ITERATIONS 500
+#define WARMUP_ITERATIONS 500  // minimum warmup before steady state can be declared
+
+// adaptive warmup: run the measured kernel in windows until the window
+// median changes by less than WARMUP_TOLERANCE for WARMUP_STABLE_WINDOWS
+// consecutive windows, or WARMUP_MAX_ITERATIONS is reached
+#define WARMUP_WINDOW 100
+#define WARMUP_STABLE_WINDOWS 3
+#define WARMUP_TOLERANCE 0.05
+#define WARMUP_MAX_ITERATIONS 20000
+
+// log-linear histogram: 2^HIST_SUB_BITS linear sub-bins per power of two,
+// values below 2^HIST_SUB_BITS get exact bins (12.5% resolution overall)
+#define HIST_SUB_BITS 3
+#define HIST_BINS ((64 - HIST_SUB_BITS + 1) << HIST_SUB_BITS)
+#define SERIES_POINTS 50
 
 // get high precision timestamp - cross-platform implementation
 static inline unsigned long long get_timestamp() {
@@ -47,10 +61,30 @@ typedef struct {
     double std_dev;
     unsigned long long p95, p99;  // 95% and 99% percentile
     unsigned long long jitter;
+    unsigned int hist[HIST_BINS];  // sample count per log-linear bin
+    unsigned long long series_avg[SERIES_POINTS];  // per-window avg, in sample order
+    unsigned long long series_max[SERIES_POINTS];  // per-window max, in sample order
+    int series_points, series_window;
+    // warmup report, warmup_status NULL = no warmup line
+    const char *warmup_status;  // "converged" or "capped"
+    int warmup_iterations;
+    unsigned long long cold_first, cold_max;        // very first sample, worst of the first window
+    unsigned long long cold_median, steady_median;  // first and last warmup window
+    const unsigned long long *warmup_samples;  // kept only with keep_warmup_samples
 } stats_t;
 
+// measured kernel: runs iteration i once and returns its timed duration
+typedef unsigned long long (*bench_kernel_t)(int i, void *ctx);
+
+// print every warmup sample after the stats block (--keep-warmup)
+extern int keep_warmup_samples;
+
 // function declarations
 void calculate_stats(unsigned long long *times, int n, stats_t *stats);
 void print_stats(const char *test_name, stats_t *stats);
+void run_benchmark(const char *test_name, bench_kernel_t kernel, void *ctx);
+void mark_block_start(void);
+int hist_bin(unsigned long long value);
+unsigned long long hist_bin_lower(int bin);
 
 #endif // COMMON_H
@@ -1,4 +1,12 @@
+#define _GNU_SOURCE
 #include "common.h"
+#include "rt_env.h"
+#include "telemetry.h"
+#include <getopt.h>
+
+#ifndef MICROBENCH_BUILD_TAG
+#define MICROBENCH_BUILD_TAG "default"
+#endif
 
 extern void test_pure_computation();
 extern void test_regular_branches();
@@ -6,11 +14,99 @@ extern void test_pseudo_random_branches();
 extern void test_nested_branches();
 extern void test_memory_branch_mixed();
 extern void test_high_frequency_branches();
+extern void test_syscall_latency();
+extern void test_page_fault_latency();
+extern void test_timer_wakeup_latency();
+
+static void print_usage(const char *prog) {
+    printf("Usage: %s [OPTIONS]\n", prog);
+    printf("Options:\n");
+    printf("  --mlockall             Lock current and future memory\n");
+    printf("  --prefault             Prefault stack and heap buffers\n");
+    printf("  --fifo PRIO            Run under SCHED_FIFO with priority PRIO\n");
+    printf("  --cpu N                Pin to CPU N\n");
+    printf("  --no-thp               Disable transparent huge pages for this process\n");
+    printf("  --dma-latency US       Hold /dev/cpu_dma_latency at US microseconds\n");
+    printf("  --governor NAME        Set cpufreq governor on all CPUs for the run\n");
+    printf("  --keep-warmup          Print every warmup sample after each test\n");
+    printf("  --telemetry FILE       Sample CPU frequency and thermal state into FILE (CSV)\n");
+    printf("  --telemetry-cpu N      Run the telemetry sampler on CPU N (default: a CPU other than --cpu)\n");
+    printf("  --telemetry-interval US  Telemetry sampling interval (default: %d)\n", TELEMETRY_INTERVAL_US);
+    printf("  --telemetry-msr        Also sample APERF/MPERF (each read sends an IPI to the benchmark CPU)\n");
+    printf("  --rt                   Shorthand for --mlockall --prefault --fifo 80 --no-thp --dma-latency 0\n");
+    printf("  -h, --help             Show this help message\n");
+    printf("\nPrior scheduler, affinity, THP and governor state is restored on exit.\n");
+}
 
-int main() {
+int main(int argc, char *argv[]) {
+    static const struct option long_options[] = {
+        {"mlockall",    no_argument,       NULL, 'm'},
+        {"prefault",    no_argument,       NULL, 'p'},
+        {"fifo",        required_argument, NULL, 'f'},
+        {"cpu",         required_argument, NULL, 'c'},
+        {"no-thp",      no_argument,       NULL, 't'},
+        {"dma-latency", required_argument, NULL, 'd'},
+        {"governor",    required_argument, NULL, 'g'},
+        {"keep-warmup", no_argument,       NULL, 'k'},
+        {"telemetry",   required_argument, NULL, 'T'},
+        {"telemetry-cpu", required_argument, NULL, 'C'},
+        {"telemetry-interval", required_argument, NULL, 'I'},
+        {"telemetry-msr", no_argument,     NULL, 'M'},
+        {"rt",          no_argument,       NULL, 'r'},
+        {"help",        no_argument,       NULL, 'h'},
+        {NULL, 0, NULL, 0}
+    };
+    rt_env_config_t config;
+    rt_env_config_init(&config);
+    const char *telemetry_path = NULL;
+    int telemetry_cpu = -1;
+    int telemetry_interval_us = TELEMETRY_INTERVAL_US;
+    int telemetry_msr = 0;
+    
+    int opt;
+    while ((opt = getopt_long(argc, argv, "h", long_options, NULL)) != -1) {
+        switch (opt) {
+            case 'm': config.mlockall = 1; break;
+            case 'p': config.prefault = 1; break;
+            case 'f': config.fifo_priority = atoi(optarg); break;
+            case 'c': config.cpu = atoi(optarg); break;
+            case 't': config.disable_thp = 1; break;
+            case 'd': config.dma_latency_us = atoi(optarg); break;
+            case 'g': config.governor = optarg; break;
+            case 'k': keep_warmup_samples = 1; break;
+            case 'T': telemetry_path = optarg; break;
+            case 'C': telemetry_cpu = atoi(optarg); break;
+            case 'I': telemetry_interval_us = atoi(optarg); break;
+            case 'M': telemetry_msr = 1; break;
+            case 'r':
+                config.mlockall = 1;
+                config.prefault = 1;
+                config.fifo_priority = 80;
+                config.disable_thp = 1;
+                config.dma_latency_us = 0;
+                break;
+            case 'h':
+                print_usage(argv[0]);
+                return 0;
+            default:
+                print_usage(argv[0]);
+                return 1;
+        }
+    }
+    
+    rt_env_apply(&config);
+    if (telemetry_path) {
+        telemetry_start(telemetry_path, telemetry_cpu, telemetry_interval_us, telemetry_msr);
+    }
+    
     printf("Scientific Real-time Determinism Test\n");
     printf("Testing CPU predictability under various branch patterns\n");
-    printf("Iterations: %d (+ %d warmup)\n\n", ITERATIONS, WARMUP_ITERATIONS);
+    printf("Iterations: %d (+ %d-%d adaptive warmup)\n", ITERATIONS, WARMUP_ITERATIONS, WARMUP_MAX_ITERATIONS);
+    printf("Build: tag=%s compiler=%s\n", MICROBENCH_BUILD_TAG, __VERSION__);
+    rt_env_print();
+    telemetry_print();
+    printf("\n");
+    mark_block_start();
     
     test_pure_computation();
     test_regular_branches();
@@ -18,6 +114,9 @@ int main() {
     test_nested_branches();
     test_memory_branch_mixed();
     test_high_frequency_branches();
+    test_syscall_latency();
+    test_page_fault_latency();
+    test_timer_wakeup_latency();
     
     return 0;
 }
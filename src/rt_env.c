@@ -0,0 +1,317 @@
+#define _GNU_SOURCE
+#include "common.h"
+#include "rt_env.h"
+#include <sched.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <malloc.h>
+#include <signal.h>
+#include <stdint.h>
+#include <sys/mman.h>
+#include <sys/prctl.h>
+#include <sys/resource.h>
+
+#define PREFAULT_STACK_SIZE (512 * 1024)
+#define PREFAULT_HEAP_SIZE (8 * 1024 * 1024)
+#define GOVERNOR_LEN 64
+#define CPUFREQ_PATH "/sys/devices/system/cpu/cpu%d/cpufreq/scaling_governor"
+
+// prior state captured before any change, restored on exit
+static struct {
+    int captured;
+    int policy;
+    struct sched_param param;
+    cpu_set_t affinity;
+    int affinity_valid;
+    int thp_disabled;
+    int ncpus;
+    char (*governors)[GOVERNOR_LEN];
+} saved;
+
+// what this process changed, so restore only undoes our own changes
+static struct {
+    const char *mlockall;
+    int prefault;
+    int fifo_priority;
+    int cpu;
+    int dma_latency_us;
+    int governor_changed;
+} effective = { "off", 0, 0, -1, -1, 0 };
+
+static int dma_latency_fd = -1;
+static volatile sig_atomic_t restored = 0;
+static volatile sig_atomic_t pending_signal = 0;
+
+void rt_env_config_init(rt_env_config_t *config) {
+    memset(config, 0, sizeof(*config));
+    config->cpu = -1;
+    config->dma_latency_us = -1;
+    config->governor = NULL;
+}
+
+static int read_governor(int cpu, char *buf, size_t len) {
+    char path[128];
+    snprintf(path, sizeof(path), CPUFREQ_PATH, cpu);
+    FILE *f = fopen(path, "r");
+    if (!f) return -1;
+    if (!fgets(buf, (int)len, f)) {
+        fclose(f);
+        return -1;
+    }
+    fclose(f);
+    buf[strcspn(buf, "\n")] = '\0';
+    return 0;
+}
+
+// async-signal-safe: no stdio, path built by hand
+static int write_governor(int cpu, const char *governor) {
+    static const char prefix[] = "/sys/devices/system/cpu/cpu";
+    static const char suffix[] = "/cpufreq/scaling_governor";
+    char path[128], digits[16];
+    size_t len = 0, ndigits = 0;
+    
+    memcpy(path, prefix, sizeof(prefix) - 1);
+    len = sizeof(prefix) - 1;
+    do {
+        digits[ndigits++] = (char)('0' + cpu % 10);
+        cpu /= 10;
+    } while (cpu > 0);
+    while (ndigits > 0) path[len++] = digits[--ndigits];
+    memcpy(path + len, suffix, sizeof(suffix));
+    
+    int fd = open(path, O_WRONLY);
+    if (fd < 0) return -1;
+    size_t n = strlen(governor);
+    int ok = write(fd, governor, n) == (ssize_t)n;
+    if (close(fd) != 0) ok = 0;
+    return ok ? 0 : -1;
+}
+
+static void capture_state(void) {
+    saved.policy = sched_getscheduler(0);
+    sched_getparam(0, &saved.param);
+    CPU_ZERO(&saved.affinity);
+    saved.affinity_valid = sched_getaffinity(0, sizeof(saved.affinity), &saved.affinity) == 0;
+    saved.thp_disabled = prctl(PR_GET_THP_DISABLE, 0, 0, 0, 0) == 1;
+    
+    // keep every CPU's governor, not just cpu0, so restore is exact
+    saved.ncpus = (int)sysconf(_SC_NPROCESSORS_CONF);
+    if (saved.ncpus < 1) saved.ncpus = 1;
+    saved.governors = calloc(saved.ncpus, GOVERNOR_LEN);
+    if (saved.governors) {
+        for (int i = 0; i < saved.ncpus; i++) {
+            if (read_governor(i, saved.governors[i], GOVERNOR_LEN) != 0) {
+                saved.governors[i][0] = '\0';
+            }
+        }
+    }
+    saved.captured = 1;
+}
+
+// touch the stack we will grow into so it is resident before measuring
+static void __attribute__((noinline)) prefault_stack(void) {
+    volatile char stack[PREFAULT_STACK_SIZE];
+    for (size_t i = 0; i < sizeof(stack); i += 4096) {
+        stack[i] = 0;
+    }
+}
+
+// keep freed heap memory in the process instead of returning it to the kernel
+static void prefault_heap(void) {
+    mallopt(M_TRIM_THRESHOLD, -1);
+    mallopt(M_MMAP_MAX, 0);
+    char *buf = malloc(PREFAULT_HEAP_SIZE);
+    if (!buf) return;
+    for (size_t i = 0; i < PREFAULT_HEAP_SIZE; i += 4096) {
+        buf[i] = 0;
+    }
+    free(buf);
+}
+
+// first signal: let the main flow exit through atexit (restore, telemetry);
+// a second one means it is stuck, so restore from here and die
+static void restore_on_signal(int sig) {
+    if (pending_signal) {
+        rt_env_restore();
+        signal(sig, SIG_DFL);
+        raise(sig);
+    }
+    pending_signal = sig;
+}
+
+// called between iterations; exits cleanly once SIGINT/SIGTERM arrived
+void rt_env_check_signal(void) {
+    if (pending_signal) {
+        exit(128 + pending_signal);
+    }
+}
+
+void rt_env_apply(const rt_env_config_t *config) {
+    capture_state();
+    atexit(rt_env_restore);
+    signal(SIGINT, restore_on_signal);
+    signal(SIGTERM, restore_on_signal);
+    
+    if (config->governor) {
+        int changed = 0;
+        for (int i = 0; saved.governors && i < saved.ncpus; i++) {
+            if (saved.governors[i][0] && write_governor(i, config->governor) == 0) {
+                changed = 1;
+            }
+        }
+        if (changed) {
+            effective.governor_changed = 1;
+        } else {
+            fprintf(stderr, "Warning: unable to set cpufreq governor to %s\n", config->governor);
+        }
+    }
+    
+    if (config->cpu >= 0) {
+        cpu_set_t set;
+        CPU_ZERO(&set);
+        CPU_SET(config->cpu, &set);
+        if (sched_setaffinity(0, sizeof(set), &set) == 0) {
+            effective.cpu = config->cpu;
+        } else {
+            fprintf(stderr, "Warning: unable to pin to CPU %d: %s\n", config->cpu, strerror(errno));
+        }
+    }
+    
+    if (config->disable_thp) {
+        if (prctl(PR_SET_THP_DISABLE, 1, 0, 0, 0) != 0) {
+            fprintf(stderr, "Warning: unable to disable THP: %s\n", strerror(errno));
+        }
+    }
+    
+    if (config->mlockall) {
+        // lock what is mapped now, then only lock future pages on fault so
+        // fresh mmap regions still take their first-touch fault in the tests
+        if (mlockall(MCL_CURRENT) == 0) {
+            effective.mlockall = "current";
+#ifdef MCL_ONFAULT
+            if (mlockall(MCL_CURRENT | MCL_FUTURE | MCL_ONFAULT) == 0) {
+                effective.mlockall = "current+onfault";
+            }
+#endif
+        } else {
+            fprintf(stderr, "Warning: mlockall failed: %s\n", strerror(errno));
+        }
+    }
+    
+    if (config->prefault) {
+        prefault_stack();
+        prefault_heap();
+        effective.prefault = 1;
+    }
+    
+    if (config->dma_latency_us >= 0) {
+        int32_t latency = config->dma_latency_us;
+        dma_latency_fd = open("/dev/cpu_dma_latency", O_WRONLY);
+        if (dma_latency_fd >= 0 && write(dma_latency_fd, &latency, sizeof(latency)) == sizeof(latency)) {
+            effective.dma_latency_us = config->dma_latency_us;
+        } else {
+            fprintf(stderr, "Warning: unable to hold /dev/cpu_dma_latency: %s\n", strerror(errno));
+            if (dma_latency_fd >= 0) close(dma_latency_fd);
+            dma_latency_fd = -1;
+        }
+    }
+    
+    // last, so the setup itself does not run at real-time priority
+    if (config->fifo_priority > 0) {
+        struct sched_param param;
+        memset(&param, 0, sizeof(param));
+        param.sched_priority = config->fifo_priority;
+        if (sched_setscheduler(0, SCHED_FIFO, &param) == 0) {
+            effective.fifo_priority = config->fifo_priority;
+        } else {
+            fprintf(stderr, "Warning: unable to set SCHED_FIFO priority %d: %s\n",
+                    config->fifo_priority, strerror(errno));
+        }
+    }
+}
+
+// cpu list as ranges, e.g. 0,2-3
+static void print_cpu_list(const cpu_set_t *set) {
+    int first = 1;
+    for (int cpu = 0; cpu < CPU_SETSIZE; cpu++) {
+        if (!CPU_ISSET(cpu, set)) continue;
+        int last = cpu;
+        while (last + 1 < CPU_SETSIZE && CPU_ISSET(last + 1, set)) last++;
+        printf(first ? "%d" : ",%d", cpu);
+        if (last > cpu) printf("-%d", last);
+        first = 0;
+        cpu = last;
+    }
+}
+
+// the state actually in effect, including anything inherited (chrt, taskset, nice)
+void rt_env_print(void) {
+    int policy = sched_getscheduler(0);
+    struct sched_param param;
+    memset(&param, 0, sizeof(param));
+    sched_getparam(0, &param);
+    errno = 0;
+    int nice_value = getpriority(PRIO_PROCESS, 0);
+    if (errno != 0) nice_value = 0;
+    
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    int affinity_valid = sched_getaffinity(0, sizeof(set), &set) == 0;
+    int governor_cpu = 0;
+    while (affinity_valid && governor_cpu < CPU_SETSIZE - 1 && !CPU_ISSET(governor_cpu, &set)) governor_cpu++;
+    char governor[GOVERNOR_LEN] = "n/a";
+    read_governor(governor_cpu, governor, sizeof(governor));
+    
+    printf("Environment: mlockall=%s prefault=%s", effective.mlockall, effective.prefault ? "on" : "off");
+    switch (policy) {
+        case SCHED_FIFO:  printf(" sched=SCHED_FIFO:%d", param.sched_priority); break;
+        case SCHED_RR:    printf(" sched=SCHED_RR:%d", param.sched_priority); break;
+        case SCHED_BATCH: printf(" sched=SCHED_BATCH"); break;
+        case SCHED_IDLE:  printf(" sched=SCHED_IDLE"); break;
+        default:          printf(" sched=SCHED_OTHER"); break;
+    }
+    printf(" nice=%d", nice_value);
+    if (!affinity_valid) {
+        printf(" cpu=unknown");
+    } else if (CPU_COUNT(&set) >= sysconf(_SC_NPROCESSORS_ONLN)) {
+        printf(" cpu=all");
+    } else {
+        printf(" cpu=");
+        print_cpu_list(&set);
+    }
+    printf(" thp=%s", prctl(PR_GET_THP_DISABLE, 0, 0, 0, 0) == 1 ? "disabled" : "default");
+    if (effective.dma_latency_us >= 0) {
+        printf(" dma_latency=%dus", effective.dma_latency_us);
+    } else {
+        printf(" dma_latency=off");
+    }
+    printf(" governor=%s\n", governor);
+}
+
+void rt_env_restore(void) {
+    if (!saved.captured || restored) return;
+    restored = 1;
+    
+    if (effective.fifo_priority > 0) {
+        sched_setscheduler(0, saved.policy, &saved.param);
+    }
+    if (dma_latency_fd >= 0) {
+        // closing the fd drops our PM QoS request
+        close(dma_latency_fd);
+        dma_latency_fd = -1;
+    }
+    if (strcmp(effective.mlockall, "off") != 0) {
+        munlockall();
+    }
+    prctl(PR_SET_THP_DISABLE, saved.thp_disabled, 0, 0, 0);
+    if (effective.cpu >= 0 && saved.affinity_valid) {
+        sched_setaffinity(0, sizeof(saved.affinity), &saved.affinity);
+    }
+    if (effective.governor_changed && saved.governors) {
+        for (int i = 0; i < saved.ncpus; i++) {
+            if (saved.governors[i][0]) {
+                write_governor(i, saved.governors[i]);
+            }
+        }
+    }
+}
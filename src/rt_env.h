@@ -0,0 +1,22 @@
+#ifndef RT_ENV_H
+#define RT_ENV_H
+
+// real-time environment requested on the command line
+typedef struct {
+    int mlockall;          // lock current and future memory
+    int prefault;          // prefault stack and heap buffers
+    int fifo_priority;     // SCHED_FIFO priority, 0 = leave scheduler alone
+    int cpu;               // pin to this CPU, -1 = leave affinity alone
+    int disable_thp;       // disable transparent huge pages via prctl
+    int dma_latency_us;    // hold /dev/cpu_dma_latency, -1 = don't
+    const char *governor;  // cpufreq governor, NULL = leave alone
+} rt_env_config_t;
+
+// function declarations
+void rt_env_config_init(rt_env_config_t *config);
+void rt_env_apply(const rt_env_config_t *config);
+void rt_env_print(void);
+void rt_env_restore(void);
+void rt_env_check_signal(void);
+
+#endif // RT_ENV_H
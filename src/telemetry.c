@@ -0,0 +1,259 @@
+#define _GNU_SOURCE
+#include "common.h"
+#include "telemetry.h"
+#include <sched.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <pthread.h>
+#include <stdint.h>
+
+#define MSR_MPERF 0xE7
+#define MSR_APERF 0xE8
+
+// one telemetry sample, -1 = not available
+typedef struct {
+    unsigned long long time_ns;
+    long cur_freq_khz;
+    long eff_freq_mhz;
+    long throttle_count;
+    long temp_mc[TELEMETRY_MAX_ZONES];
+} telemetry_sample_t;
+
+static struct {
+    int running;
+    volatile int stop;
+    pthread_t thread;
+    const char *path;
+    int bench_cpu, sampler_cpu, interval_us;  // bench_cpu -1 = unpinned
+    int use_msr;
+    int freq_fd, throttle_fd, msr_fd;
+    int nzones;
+    int zone_fd[TELEMETRY_MAX_ZONES];
+    char zone_type[TELEMETRY_MAX_ZONES][32];
+    telemetry_sample_t *samples;
+    int nsamples;
+} tm = { .freq_fd = -1, .throttle_fd = -1, .msr_fd = -1 };
+
+static unsigned long long monotonic_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (unsigned long long)ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+}
+
+// sysfs values re-read from offset 0 without reopening
+static long read_long_fd(int fd) {
+    char buf[32];
+    if (fd < 0) return -1;
+    ssize_t len = pread(fd, buf, sizeof(buf) - 1, 0);
+    if (len <= 0) return -1;
+    buf[len] = '\0';
+    return strtol(buf, NULL, 10);
+}
+
+static int read_msr(int fd, unsigned int reg, uint64_t *value) {
+    return fd >= 0 && pread(fd, value, sizeof(*value), reg) == sizeof(*value) ? 0 : -1;
+}
+
+static void open_sources(void) {
+    char path[128];
+    
+    // per-CPU sources only mean something when the benchmark cannot migrate
+    if (tm.bench_cpu >= 0) {
+        snprintf(path, sizeof(path), "/sys/devices/system/cpu/cpu%d/cpufreq/scaling_cur_freq", tm.bench_cpu);
+        tm.freq_fd = open(path, O_RDONLY);
+        snprintf(path, sizeof(path), "/sys/devices/system/cpu/cpu%d/thermal_throttle/core_throttle_count", tm.bench_cpu);
+        tm.throttle_fd = open(path, O_RDONLY);
+    }
+    // APERF/MPERF needs the msr driver and root, and every read IPIs the
+    // benchmark CPU, so it is only opened on request
+    if (tm.use_msr && tm.bench_cpu >= 0) {
+        snprintf(path, sizeof(path), "/dev/cpu/%d/msr", tm.bench_cpu);
+        tm.msr_fd = open(path, O_RDONLY);
+        if (tm.msr_fd < 0) {
+            fprintf(stderr, "Warning: unable to open %s: %s, APERF/MPERF disabled\n", path, strerror(errno));
+        }
+    }
+    
+    tm.nzones = 0;
+    for (int z = 0; tm.nzones < TELEMETRY_MAX_ZONES; z++) {
+        snprintf(path, sizeof(path), "/sys/class/thermal/thermal_zone%d/temp", z);
+        int fd = open(path, O_RDONLY);
+        if (fd < 0) break;
+        
+        snprintf(path, sizeof(path), "/sys/class/thermal/thermal_zone%d/type", z);
+        FILE *f = fopen(path, "r");
+        char *type = tm.zone_type[tm.nzones];
+        if (!f || !fgets(type, sizeof(tm.zone_type[0]), f)) {
+            snprintf(type, sizeof(tm.zone_type[0]), "zone%d", z);
+        }
+        if (f) fclose(f);
+        type[strcspn(type, "\n")] = '\0';
+        tm.zone_fd[tm.nzones++] = fd;
+    }
+}
+
+static void close_sources(void) {
+    if (tm.freq_fd >= 0) close(tm.freq_fd);
+    if (tm.throttle_fd >= 0) close(tm.throttle_fd);
+    if (tm.msr_fd >= 0) close(tm.msr_fd);
+    for (int z = 0; z < tm.nzones; z++) close(tm.zone_fd[z]);
+    tm.freq_fd = tm.throttle_fd = tm.msr_fd = -1;
+    tm.nzones = 0;
+}
+
+static void *sampler_main(void *arg) {
+    (void)arg;
+    uint64_t prev_aperf = 0, prev_mperf = 0;
+    unsigned long long prev_ns = 0;
+    int have_prev = 0;
+    struct timespec next;
+    clock_gettime(CLOCK_MONOTONIC, &next);
+    
+    while (!tm.stop && tm.nsamples < TELEMETRY_MAX_SAMPLES) {
+        telemetry_sample_t *s = &tm.samples[tm.nsamples];
+        s->time_ns = monotonic_ns();
+        s->cur_freq_khz = read_long_fd(tm.freq_fd);
+        s->throttle_count = read_long_fd(tm.throttle_fd);
+        for (int z = 0; z < tm.nzones; z++) {
+            s->temp_mc[z] = read_long_fd(tm.zone_fd[z]);
+        }
+        
+        // effective frequency = MPERF rate (TSC, ticks/us) * dAPERF / dMPERF
+        s->eff_freq_mhz = -1;
+        uint64_t aperf, mperf;
+        if (read_msr(tm.msr_fd, MSR_APERF, &aperf) == 0 && read_msr(tm.msr_fd, MSR_MPERF, &mperf) == 0) {
+            if (have_prev && mperf > prev_mperf && s->time_ns > prev_ns) {
+                double mperf_mhz = (double)(mperf - prev_mperf) * 1000.0 / (double)(s->time_ns - prev_ns);
+                s->eff_freq_mhz = (long)(mperf_mhz * (double)(aperf - prev_aperf) / (double)(mperf - prev_mperf));
+            }
+            prev_aperf = aperf;
+            prev_mperf = mperf;
+            prev_ns = s->time_ns;
+            have_prev = 1;
+        }
+        tm.nsamples++;
+        
+        next.tv_nsec += (long)tm.interval_us * 1000;
+        while (next.tv_nsec >= 1000000000L) {
+            next.tv_nsec -= 1000000000L;
+            next.tv_sec++;
+        }
+        clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &next, NULL);
+    }
+    return NULL;
+}
+
+// the single CPU the calling thread may run on, -1 if it can migrate
+static int pinned_cpu(void) {
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    if (sched_getaffinity(0, sizeof(set), &set) != 0 || CPU_COUNT(&set) != 1) return -1;
+    for (int cpu = 0; cpu < CPU_SETSIZE; cpu++) {
+        if (CPU_ISSET(cpu, &set)) return cpu;
+    }
+    return -1;
+}
+
+// start sampling on sampler_cpu (-1 = highest CPU other than the benchmark's);
+// call after the benchmark thread has been pinned
+int telemetry_start(const char *path, int sampler_cpu, int interval_us, int use_msr) {
+    int ncpus = (int)sysconf(_SC_NPROCESSORS_ONLN);
+    int bench_cpu = pinned_cpu();
+    if (bench_cpu < 0) {
+        fprintf(stderr, "Warning: benchmark is not pinned to one CPU (use --cpu), "
+                        "per-CPU frequency and throttle telemetry disabled\n");
+    }
+    if (sampler_cpu < 0) {
+        sampler_cpu = ncpus - 1 != bench_cpu ? ncpus - 1 : ncpus - 2;
+        if (sampler_cpu < 0) {
+            fprintf(stderr, "Warning: no spare CPU for the telemetry sampler, telemetry disabled\n");
+            return -1;
+        }
+    } else if (sampler_cpu == bench_cpu) {
+        fprintf(stderr, "Warning: telemetry sampler shares CPU %d with the benchmark\n", bench_cpu);
+    }
+    
+    tm.samples = calloc(TELEMETRY_MAX_SAMPLES, sizeof(telemetry_sample_t));
+    if (!tm.samples) return -1;
+    tm.path = path;
+    tm.bench_cpu = bench_cpu;
+    tm.sampler_cpu = sampler_cpu;
+    tm.interval_us = interval_us > 0 ? interval_us : TELEMETRY_INTERVAL_US;
+    tm.use_msr = use_msr;
+    tm.nsamples = 0;
+    tm.stop = 0;
+    open_sources();
+    
+    // plain SCHED_OTHER on its own CPU, whatever the benchmark thread runs at
+    pthread_attr_t attr;
+    pthread_attr_init(&attr);
+    pthread_attr_setinheritsched(&attr, PTHREAD_EXPLICIT_SCHED);
+    pthread_attr_setschedpolicy(&attr, SCHED_OTHER);
+    struct sched_param param;
+    memset(&param, 0, sizeof(param));
+    pthread_attr_setschedparam(&attr, &param);
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    CPU_SET(sampler_cpu, &set);
+    pthread_attr_setaffinity_np(&attr, sizeof(set), &set);
+    
+    int err = pthread_create(&tm.thread, &attr, sampler_main, NULL);
+    pthread_attr_destroy(&attr);
+    if (err != 0) {
+        fprintf(stderr, "Warning: unable to start telemetry sampler: %s\n", strerror(err));
+        close_sources();
+        free(tm.samples);
+        tm.samples = NULL;
+        return -1;
+    }
+    tm.running = 1;
+    atexit(telemetry_stop);
+    return 0;
+}
+
+// stop the sampler and write all samples to the telemetry file
+void telemetry_stop(void) {
+    if (!tm.running) return;
+    tm.running = 0;
+    tm.stop = 1;
+    pthread_join(tm.thread, NULL);
+    int msr = tm.msr_fd >= 0;
+    close_sources();
+    
+    FILE *f = fopen(tm.path, "w");
+    if (!f) {
+        fprintf(stderr, "Warning: unable to write telemetry file %s: %s\n", tm.path, strerror(errno));
+    } else {
+        fprintf(f, "# MicroBench telemetry: bench_cpu=");
+        if (tm.bench_cpu >= 0) {
+            fprintf(f, "%d", tm.bench_cpu);
+        } else {
+            fprintf(f, "unpinned");
+        }
+        fprintf(f, " sampler_cpu=%d interval_us=%d msr=%s\n", tm.sampler_cpu, tm.interval_us, msr ? "on" : "off");
+        fprintf(f, "time_ns,cur_freq_khz,eff_freq_mhz,throttle_count");
+        for (int z = 0; z < tm.nzones; z++) fprintf(f, ",temp_mc_%s", tm.zone_type[z]);
+        fprintf(f, "\n");
+        for (int i = 0; i < tm.nsamples; i++) {
+            telemetry_sample_t *s = &tm.samples[i];
+            fprintf(f, "%llu,%ld,%ld,%ld", s->time_ns, s->cur_freq_khz, s->eff_freq_mhz, s->throttle_count);
+            for (int z = 0; z < tm.nzones; z++) fprintf(f, ",%ld", s->temp_mc[z]);
+            fprintf(f, "\n");
+        }
+        fclose(f);
+    }
+    free(tm.samples);
+    tm.samples = NULL;
+}
+
+void telemetry_print(void) {
+    if (!tm.running) return;
+    printf("Telemetry: file=%s", tm.path);
+    if (tm.bench_cpu >= 0) {
+        printf(" bench_cpu=%d", tm.bench_cpu);
+    } else {
+        printf(" bench_cpu=unpinned");
+    }
+    printf(" sampler_cpu=%d interval_us=%d msr=%s\n",
+           tm.sampler_cpu, tm.interval_us, tm.msr_fd >= 0 ? "on" : "off");
+}
@@ -0,0 +1,13 @@
+#ifndef TELEMETRY_H
+#define TELEMETRY_H
+
+#define TELEMETRY_INTERVAL_US 10000   // 10ms between samples
+#define TELEMETRY_MAX_SAMPLES 65536   // ~11 minutes at the default interval
+#define TELEMETRY_MAX_ZONES 16
+
+// function declarations
+int telemetry_start(const char *path, int sampler_cpu, int interval_us, int use_msr);
+void telemetry_stop(void);
+void telemetry_print(void);
+
+#endif // TELEMETRY_H
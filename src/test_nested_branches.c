@@ -1,49 +1,35 @@
 #include "common.h"
 
-// test 4: complex nested branches
-void test_nested_branches() {
-    unsigned long long times[ITERATIONS];
-    volatile int result = 0;
+static volatile int result = 0;
+
+// measured kernel - nested branches increase prediction difficulty
+static unsigned long long nested_branches_kernel(int i, void *ctx) {
+    (void)ctx;
+    unsigned long long start = get_timestamp();
     
-    // warmup
-    for (int i = 0; i < WARMUP_ITERATIONS; i++) {
-        int x = i % 8;
-        if (x > 4) {
-            if (x > 6) result += 1;
-            else result += 2;
+    volatile int x = (i * 7 + 3) % 16;  // more complex pattern
+    
+    if (x > 8) {
+        if (x > 12) {
+            result += (x & 0x1) ? 1 : 2;
         } else {
-            if (x > 2) result += 3;
-            else result += 4;
+            result += (x & 0x2) ? 3 : 4;
         }
-    }
-    
-    // main test - nested branches increase prediction difficulty
-    for (int i = 0; i < ITERATIONS; i++) {
-        unsigned long long start = get_timestamp();
-        
-        volatile int x = (i * 7 + 3) % 16;  // more complex pattern
-        
-        if (x > 8) {
-            if (x > 12) {
-                result += (x & 0x1) ? 1 : 2;
-            } else {
-                result += (x & 0x2) ? 3 : 4;
-            }
+    } else {
+        if (x > 4) {
+            result += (x & 0x4) ? 5 : 6;
         } else {
-            if (x > 4) {
-                result += (x & 0x4) ? 5 : 6;
-            } else {
-                result += (x & 0x8) ? 7 : 8;
-            }
+            result += (x & 0x8) ? 7 : 8;
         }
-        
-        unsigned long long end = get_timestamp();
-        times[i] = end - start;
     }
     
-    stats_t stats;
-    calculate_stats(times, ITERATIONS, &stats);
-    print_stats("Nested Branch Pattern", &stats);
+    unsigned long long end = get_timestamp();
+    return end - start;
+}
+
+// test 4: complex nested branches
+void test_nested_branches() {
+    run_benchmark("Nested Branch Pattern", nested_branches_kernel, NULL);
 }
 
 // This file contains only the test function
@@ -0,0 +1,74 @@
+#define _GNU_SOURCE
+#include "common.h"
+#include <sys/mman.h>
+
+typedef struct {
+    volatile char *region;
+    long page_size;
+} page_region_t;
+
+// measured kernel - write to an already mapped page
+static unsigned long long prefaulted_page_kernel(int i, void *ctx) {
+    page_region_t *warm = ctx;
+    unsigned long long start = get_timestamp();
+    
+    warm->region[(size_t)(i % ITERATIONS) * warm->page_size] = 1;
+    
+    unsigned long long end = get_timestamp();
+    return end - start;
+}
+
+// test 8: minor page faults on fresh mmap pages vs prefaulted pages
+void test_page_fault_latency() {
+    unsigned long long times[ITERATIONS];
+    long page_size = sysconf(_SC_PAGESIZE);
+    size_t region_size = (size_t)page_size * ITERATIONS;
+    
+    // one page per iteration, so every fresh touch takes exactly one fault
+    volatile char *fresh = mmap(NULL, region_size, PROT_READ | PROT_WRITE,
+                                MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    volatile char *warm = mmap(NULL, region_size, PROT_READ | PROT_WRITE,
+                               MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    if (fresh == MAP_FAILED || warm == MAP_FAILED) {
+        fprintf(stderr, "Warning: mmap failed, skipping page fault test\n");
+        if (fresh != MAP_FAILED) munmap((void *)fresh, region_size);
+        if (warm != MAP_FAILED) munmap((void *)warm, region_size);
+        return;
+    }
+    
+#ifdef MADV_NOHUGEPAGE
+    // keep transparent huge pages from serving many touches with one fault
+    madvise((void *)fresh, region_size, MADV_NOHUGEPAGE);
+    madvise((void *)warm, region_size, MADV_NOHUGEPAGE);
+#endif
+    
+    // prefault the second region
+    for (int i = 0; i < ITERATIONS; i++) {
+        warm[(size_t)i * page_size] = 1;
+    }
+    
+    // main test - first write to each page triggers a minor fault,
+    // no warmup since a fresh page can only be touched once
+    for (int i = 0; i < ITERATIONS; i++) {
+        unsigned long long start = get_timestamp();
+        
+        fresh[(size_t)i * page_size] = 1;
+        
+        unsigned long long end = get_timestamp();
+        times[i] = end - start;
+    }
+    
+    stats_t stats;
+    calculate_stats(times, ITERATIONS, &stats);
+    print_stats("Page Fault (Fresh mmap)", &stats);
+    
+    // main test - same access pattern on already mapped pages
+    page_region_t warm_region = { warm, page_size };
+    run_benchmark("Page Fault (Prefaulted)", prefaulted_page_kernel, &warm_region);
+    
+    munmap((void *)fresh, region_size);
+    munmap((void *)warm, region_size);
+}
+
+// This file contains only the test function
+// Main function is in microbench_main.c
@@ -1,39 +1,42 @@
 #include "common.h"
 
-// test 3: pseudo-random branch pattern
-void test_pseudo_random_branches() {
-    unsigned long long times[ITERATIONS];
-    volatile int result = 0;
+static volatile int result = 0;
+
+typedef struct {
+    unsigned int seed;
+    unsigned int initial;
+} lcg_state_t;
+
+// measured kernel - difficult to predict branch pattern
+static unsigned long long pseudo_random_branches_kernel(int i, void *ctx) {
+    lcg_state_t *lcg = ctx;
+    // the measured loop restarts at i = 0, so it always sees the same sequence
+    // however many iterations the adaptive warmup took
+    if (i == 0) lcg->seed = lcg->initial;
+    unsigned long long start = get_timestamp();
     
-    // use linear congruential generator to generate pseudo-random number
-    unsigned int seed = 12345;
+    lcg->seed = lcg->seed * 1664525 + 1013904223;
+    volatile int x = lcg->seed % 7;
     
-    // warmup
-    for (int i = 0; i < WARMUP_ITERATIONS; i++) {
-        seed = seed * 1664525 + 1013904223;
-        if (seed & 0x1) result += 1;
-        else result += 2;
-    }
+    if (x < 2) result += 1;
+    else if (x < 4) result += 2;
+    else if (x < 6) result += 3;
+    else result += 4;
     
-    // main test - difficult to predict branch pattern
-    for (int i = 0; i < ITERATIONS; i++) {
-        unsigned long long start = get_timestamp();
-        
-        seed = seed * 1664525 + 1013904223;
-        volatile int x = seed % 7;
-        
-        if (x < 2) result += 1;
-        else if (x < 4) result += 2;
-        else if (x < 6) result += 3;
-        else result += 4;
-        
-        unsigned long long end = get_timestamp();
-        times[i] = end - start;
+    unsigned long long end = get_timestamp();
+    return end - start;
+}
+
+// test 3: pseudo-random branch pattern
+void test_pseudo_random_branches() {
+    // use linear congruential generator to generate pseudo-random number,
+    // measured from the same point as the original fixed 500-draw warmup
+    lcg_state_t lcg = { 12345, 12345 };
+    for (int i = 0; i < WARMUP_ITERATIONS; i++) {
+        lcg.initial = lcg.initial * 1664525 + 1013904223;
     }
     
-    stats_t stats;
-    calculate_stats(times, ITERATIONS, &stats);
-    print_stats("Pseudo-Random Branch Pattern", &stats);
+    run_benchmark("Pseudo-Random Branch Pattern", pseudo_random_branches_kernel, &lcg);
 }
 
 // This file contains only the test function
@@ -1,35 +1,25 @@
 #include "common.h"
 
-// test 2: regular branch pattern
-void test_regular_branches() {
-    unsigned long long times[ITERATIONS];
-    volatile int result = 0;
-    
-    // warmup
-    for (int i = 0; i < WARMUP_ITERATIONS; i++) {
-        int x = i % 4;
-        if (x == 0) result += 1;
-        else if (x == 1) result += 2;
-        else result += 3;
-    }
+static volatile int result = 0;
+
+// measured kernel - modulo-4 branch pattern
+static unsigned long long regular_branches_kernel(int i, void *ctx) {
+    (void)ctx;
+    unsigned long long start = get_timestamp();
     
-    // main test
-    for (int i = 0; i < ITERATIONS; i++) {
-        unsigned long long start = get_timestamp();
-        
-        volatile int x = i % 4;
-        if (x == 0) result += 1;
-        else if (x == 1) result += 2;
-        else if (x == 2) result += 3;
-        else result += 4;
-        
-        unsigned long long end = get_timestamp();
-        times[i] = end - start;
-    }
+    volatile int x = i % 4;
+    if (x == 0) result += 1;
+    else if (x == 1) result += 2;
+    else if (x == 2) result += 3;
+    else result += 4;
     
-    stats_t stats;
-    calculate_stats(times, ITERATIONS, &stats);
-    print_stats("Regular Branch Pattern", &stats);
+    unsigned long long end = get_timestamp();
+    return end - start;
+}
+
+// test 2: regular branch pattern
+void test_regular_branches() {
+    run_benchmark("Regular Branch Pattern", regular_branches_kernel, NULL);
 }
 
 // This file contains only the test function
@@ -0,0 +1,40 @@
+#define _GNU_SOURCE
+#include "common.h"
+#include <sys/syscall.h>
+
+static volatile long result = 0;
+
+// measured kernel - raw syscall, bypasses any libc caching of getppid()
+static unsigned long long getppid_kernel(int i, void *ctx) {
+    (void)i;
+    (void)ctx;
+    unsigned long long start = get_timestamp();
+    
+    result += syscall(SYS_getppid);
+    
+    unsigned long long end = get_timestamp();
+    return end - start;
+}
+
+// measured kernel - vDSO clock_gettime, stays in user space on most hosts
+static unsigned long long clock_gettime_kernel(int i, void *ctx) {
+    (void)i;
+    (void)ctx;
+    struct timespec ts;
+    unsigned long long start = get_timestamp();
+    
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    result += ts.tv_nsec;
+    
+    unsigned long long end = get_timestamp();
+    return end - start;
+}
+
+// test 7: kernel entry cost of trivial syscalls
+void test_syscall_latency() {
+    run_benchmark("Syscall getppid", getppid_kernel, NULL);
+    run_benchmark("vDSO clock_gettime", clock_gettime_kernel, NULL);
+}
+
+// This file contains only the test function
+// Main function is in microbench_main.c
@@ -0,0 +1,48 @@
+#define _GNU_SOURCE
+#include "common.h"
+#include "rt_env.h"
+#include <sched.h>
+#include <errno.h>
+
+#define TIMER_INTERVAL_NS 500000ULL  // 500us period, cyclictest style
+#define NSEC_PER_SEC 1000000000ULL
+
+// test 9: periodic clock_nanosleep(TIMER_ABSTIME) wakeup latency
+// note: results are in nanoseconds, not CPU cycles
+void test_timer_wakeup_latency() {
+    unsigned long long times[ITERATIONS];
+    struct timespec next, now;
+    
+    // label by the policy in effect (--fifo, or inherited from chrt), which
+    // the Environment: header also records
+    int running_fifo = sched_getscheduler(0) == SCHED_FIFO;
+    
+    clock_gettime(CLOCK_MONOTONIC, &next);
+    
+    // warmup and main test share one timeline so every period is absolute
+    for (int i = 0; i < WARMUP_ITERATIONS + ITERATIONS; i++) {
+        rt_env_check_signal();  // this loop runs for over a second
+        next.tv_nsec += TIMER_INTERVAL_NS;
+        while ((unsigned long long)next.tv_nsec >= NSEC_PER_SEC) {
+            next.tv_nsec -= NSEC_PER_SEC;
+            next.tv_sec++;
+        }
+        
+        while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &next, NULL) == EINTR)
+            ;
+        clock_gettime(CLOCK_MONOTONIC, &now);
+        
+        long long diff = (long long)(now.tv_sec - next.tv_sec) * (long long)NSEC_PER_SEC
+                         + (now.tv_nsec - next.tv_nsec);
+        if (i >= WARMUP_ITERATIONS) {
+            times[i - WARMUP_ITERATIONS] = diff > 0 ? (unsigned long long)diff : 0;
+        }
+    }
+    
+    stats_t stats;
+    calculate_stats(times, ITERATIONS, &stats);
+    print_stats(running_fifo ? "Timer Wakeup Latency (SCHED_FIFO)" : "Timer Wakeup Latency", &stats);
+}
+
+// This file contains only the test function
+// Main function is in microbench_main.c
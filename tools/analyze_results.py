@@ -14,6 +14,33 @@ try:
 except ImportError:
     HAS_MATPLOTLIB = False
 
+# 解析结果格式版本，修改解析逻辑或记录字段时递增，使分析缓存失效
+ANALYZER_VERSION = "3"
+
+# 与 src/common.h 保持一致的直方图和预热参数
+HIST_SUB_BITS = 3
+HIST_BINS = (64 - HIST_SUB_BITS + 1) << HIST_SUB_BITS
+WARMUP_WINDOW = 100
+WARMUP_TOLERANCE = 0.05
+
+# 测试窗口内频率低于整次运行最高频率的该比例时记为频率下探 (Freq_Dip)；
+# 只有 performance 调速器下的下探才算作降频，其他调速器下这是正常的调频
+THROTTLE_FREQ_RATIO = 0.9
+
+# 实时性评分的归一化分组：量级或单位不同的测试只在组内比较，
+# 避免缺页测试(数千周期)和定时器测试(纳秒)拉高其他测试的评分。
+# 单次短操作(系统调用、vDSO、已映射页写入，数十到数百周期)与分支测试分开，
+# 以保持分支测试原有的评分
+SCORE_GROUPS = {
+    "Syscall getppid": "short_ops",
+    "vDSO clock_gettime": "short_ops",
+    "Page Fault (Prefaulted)": "short_ops",
+    "Page Fault (Fresh mmap)": "page_fault",
+    "Timer Wakeup Latency": "timer_ns",
+    "Timer Wakeup Latency (SCHED_FIFO)": "timer_ns",
+}
+SCORE_GROUP_DEFAULT = "branch"
+
 class RealTimeAnalyzer:
     def __init__(self):
         self.test_cases = [
@@ -22,9 +49,22 @@ class RealTimeAnalyzer:
             "Pseudo-Random Branch Pattern",
             "Nested Branch Pattern",
             "Memory + Branch Mixed",
-            "High-Frequency Branches"
+            "High-Frequency Branches",
+            "Syscall getppid",
+            "vDSO clock_gettime",
+            "Page Fault (Fresh mmap)",
+            "Page Fault (Prefaulted)",
+            "Timer Wakeup Latency",
+            "Timer Wakeup Latency (SCHED_FIFO)"
         ]
         self.results = {}
+        self.histograms = {}  # test_case -> {bin_lower: count}
+        self.series = {}      # test_case -> (window, [avg], [max])
+        self.warmup_samples = {}  # test_case -> [warmup samples] (--keep-warmup)
+        self.time_windows = {}    # test_case -> (start_ns, end_ns), CLOCK_MONOTONIC
+        self.telemetry_file = None
+        self.environment = {}
+        self.environment_label = "unknown"
         self.cpu_model = self._get_cpu_model()
     
     def _get_cpu_model(self) -> str:
@@ -85,28 +125,196 @@ class RealTimeAnalyzer:
                 'cv': float(match[8])
             }
         
+        # 解析每个测试块中的直方图和时间序列 (旧格式结果中没有)
+        self.histograms = {}
+        self.series = {}
+        self.warmup_samples = {}
+        self.time_windows = {}
+        headers = list(re.finditer(r'^=== (.+?) ===$', content, re.MULTILINE))
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+            block = content[header.end():end]
+            test_name = header.group(1)
+            
+            hist_match = re.search(r'Histogram:(.*)', block)
+            if hist_match:
+                self.histograms[test_name] = {
+                    int(lower): int(count)
+                    for lower, count in (item.split(':') for item in hist_match.group(1).split())
+                }
+            
+            series_match = re.search(r'Series \(window (\d+)\):(.*)', block)
+            if series_match:
+                points = [item.split('/') for item in series_match.group(2).split()]
+                self.series[test_name] = (
+                    int(series_match.group(1)),
+                    [int(avg) for avg, _ in points],
+                    [int(peak) for _, peak in points]
+                )
+        
+            # 旧版结果没有 cold first/cold max
+            warmup_match = re.search(
+                r'Warmup: (\d+) iterations \((\w+)\), (?:cold first (\d+), cold max (\d+), )?'
+                r'cold median (\d+), steady median (\d+)', block)
+            if warmup_match and test_name in results:
+                results[test_name]['warmup_iterations'] = int(warmup_match.group(1))
+                results[test_name]['warmup_converged'] = warmup_match.group(2) == 'converged'
+                if warmup_match.group(3) is not None:
+                    results[test_name]['cold_first'] = int(warmup_match.group(3))
+                    results[test_name]['cold_max'] = int(warmup_match.group(4))
+                results[test_name]['cold_median'] = int(warmup_match.group(5))
+                results[test_name]['steady_median'] = int(warmup_match.group(6))
+            
+            window_match = re.search(r'Time Window: (\d+) (\d+)', block)
+            if window_match:
+                self.time_windows[test_name] = (int(window_match.group(1)), int(window_match.group(2)))
+            
+            samples_match = re.search(r'Warmup Samples:(.*)', block)
+            if samples_match:
+                self.warmup_samples[test_name] = [int(v) for v in samples_match.group(1).split()]
+        
+        # 解析运行环境头 (bin/microbench 写入的 Environment: key=value ...)
+        env_match = re.search(r'^Environment: (.+)$', content, re.MULTILINE)
+        if env_match:
+            self.environment_label = env_match.group(1).strip()
+            self.environment = dict(
+                token.split('=', 1) for token in self.environment_label.split() if '=' in token
+            )
+        
+        # 关联同一次运行的频率/温度遥测数据
+        self.telemetry_file = self.resolve_telemetry_path(content, filename)
+        if self.telemetry_file:
+            self._correlate_telemetry(self.telemetry_file, results)
+        
         self.results = results
         return results
     
+    @staticmethod
+    def resolve_telemetry_path(content: str, filename: str):
+        """结果头中引用的遥测文件路径，不存在时返回 None"""
+        telemetry_match = re.search(r'^Telemetry: file=(\S+)', content, re.MULTILINE)
+        if not telemetry_match:
+            return None
+        path = telemetry_match.group(1)
+        if not os.path.exists(path):
+            # 结果目录被移动后按文件名在结果文件旁查找
+            path = os.path.join(os.path.dirname(filename), os.path.basename(path))
+        return path if os.path.exists(path) else None
+    
+    def to_record(self) -> Dict:
+        """解析结果的可序列化形式，供分析缓存使用"""
+        return {
+            'results': self.results,
+            'histograms': self.histograms,
+            'series': self.series,
+            'warmup_samples': self.warmup_samples,
+            'time_windows': self.time_windows,
+            'environment': self.environment,
+            'environment_label': self.environment_label,
+            'telemetry_file': self.telemetry_file,
+        }
+    
+    def load_record(self, record: Dict) -> Dict:
+        """从缓存记录恢复解析结果 (JSON 键均为字符串，需还原直方图的整数键)"""
+        self.results = record['results']
+        self.histograms = {
+            test_name: {int(lower): count for lower, count in bins.items()}
+            for test_name, bins in record['histograms'].items()
+        }
+        self.series = {test_name: tuple(data) for test_name, data in record['series'].items()}
+        self.warmup_samples = record['warmup_samples']
+        self.time_windows = {test_name: tuple(window) for test_name, window in record['time_windows'].items()}
+        self.environment = record['environment']
+        self.environment_label = record['environment_label']
+        self.telemetry_file = record['telemetry_file']
+        return self.results
+    
+    def _correlate_telemetry(self, telemetry_file: str, results: Dict):
+        """按每个测试的时间窗口汇总遥测数据，并标记降频的测试"""
+        with open(telemetry_file, 'r') as f:
+            rows = list(csv.DictReader(line for line in f if not line.startswith('#')))
+        if not rows:
+            return
+        
+        times = [int(row['time_ns']) for row in rows]
+        temp_columns = [col for col in rows[0] if col.startswith('temp_mc_')]
+        
+        def column(name):
+            return [int(row[name]) for row in rows]
+        
+        cur_freq = column('cur_freq_khz')
+        eff_freq = column('eff_freq_mhz')
+        throttle = column('throttle_count')
+        temps = [max((int(row[col]) for col in temp_columns), default=-1) for row in rows]
+        
+        # 整次运行的参考最高频率
+        peak_cur = max(cur_freq)
+        peak_eff = max(eff_freq)
+        
+        import bisect
+        for test_name, (start, end) in self.time_windows.items():
+            if test_name not in results:
+                continue
+            lo = bisect.bisect_left(times, start)
+            hi = bisect.bisect_right(times, end)
+            if lo == hi:
+                # 窗口短于采样间隔时取最近的一个样本
+                lo = min(lo, len(times) - 1)
+                hi = lo + 1
+            
+            data = results[test_name]
+            window_cur = [v for v in cur_freq[lo:hi] if v >= 0]
+            window_eff = [v for v in eff_freq[lo:hi] if v >= 0]
+            window_temp = [v for v in temps[lo:hi] if v >= 0]
+            window_throttle = [v for v in throttle[max(lo - 1, 0):hi] if v >= 0]
+            
+            freq_dip = False
+            if window_cur:
+                data['freq_min_khz'] = min(window_cur)
+                data['freq_avg_khz'] = sum(window_cur) / len(window_cur)
+                freq_dip |= data['freq_min_khz'] < THROTTLE_FREQ_RATIO * peak_cur
+            if window_eff:
+                data['eff_freq_min_mhz'] = min(window_eff)
+                freq_dip |= data['eff_freq_min_mhz'] < THROTTLE_FREQ_RATIO * peak_eff
+            if window_temp:
+                data['temp_max_mc'] = max(window_temp)
+            
+            throttled = freq_dip and self.environment.get('governor') == 'performance'
+            if window_throttle:
+                data['throttle_events'] = window_throttle[-1] - window_throttle[0]
+                throttled |= data['throttle_events'] > 0
+            data['freq_dip'] = freq_dip
+            data['throttled'] = throttled
+    
     def calculate_realtime_scores(self) -> Dict:
         """计算量化的实时性评分"""
         scores = {}
         
-        # 收集所有指标用于归一化
-        all_jitters = [data['jitter'] for data in self.results.values()]
-        all_std_devs = [data['std_dev'] for data in self.results.values()]
-        all_cvs = [data['cv'] for data in self.results.values()]
-        all_max_avg_ratios = [data['max'] / data['avg'] for data in self.results.values()]
-        all_p99_avg_ratios = [data['p99'] / data['avg'] for data in self.results.values()]
-        
-        # 计算归一化参数
-        max_jitter = max(all_jitters)
-        max_std_dev = max(all_std_devs)
-        max_cv = max(all_cvs)
-        max_ratio = max(all_max_avg_ratios)
-        max_p99_ratio = max(all_p99_avg_ratios)
+        # 按评分组收集指标，归一化参数只在同组测试内计算
+        groups = {}
+        for test_name, data in self.results.items():
+            group = SCORE_GROUPS.get(test_name, SCORE_GROUP_DEFAULT)
+            groups.setdefault(group, []).append(data)
+        
+        norms = {}
+        for group, members in groups.items():
+            norms[group] = {
+                'jitter': max(data['jitter'] for data in members),
+                'std_dev': max(data['std_dev'] for data in members),
+                'cv': max(data['cv'] for data in members),
+                'ratio': max(data['max'] / data['avg'] for data in members),
+                'p99_ratio': max(data['p99'] / data['avg'] for data in members)
+            }
         
         for test_name, data in self.results.items():
+            group = SCORE_GROUPS.get(test_name, SCORE_GROUP_DEFAULT)
+            norm = norms[group]
+            max_jitter = norm['jitter']
+            max_std_dev = norm['std_dev']
+            max_cv = norm['cv']
+            max_ratio = norm['ratio']
+            max_p99_ratio = norm['p99_ratio']
+            
             # 1. 抖动评分 (0-100, 越高越好)
             jitter_score = max(0, 100 * (1 - data['jitter'] / max_jitter))
             
@@ -141,8 +349,10 @@ class RealTimeAnalyzer:
                 weights['p99'] * p99_score
             )
             
-            # 7. 实时性等级评定
-            if overall_score >= 90:
+            # 7. 实时性等级评定 (组内只有一个测试时相对评分没有意义)
+            if len(groups[group]) < 2:
+                rt_grade = "N/A"
+            elif overall_score >= 90:
                 rt_grade = "Excellent"
             elif overall_score >= 75:
                 rt_grade = "Good"
@@ -184,7 +394,9 @@ class RealTimeAnalyzer:
             'Max_Avg_Ratio', 'P99_Avg_Ratio',
             'Jitter_Score', 'StdDev_Score', 'CV_Score',
             'Ratio_Score', 'P99_Score', 'Overall_RT_Score',
-            'RT_Grade'
+            'RT_Grade',
+            'Warmup_Iterations', 'Warmup_Converged', 'Cold_First', 'Cold_Max', 'Cold_Median', 'Steady_Median',
+            'Freq_Min_kHz', 'Eff_Freq_Min_MHz', 'Temp_Max_mC', 'Throttle_Events', 'Freq_Dip', 'Throttled'
         ]
         
         rows = []
@@ -201,7 +413,19 @@ class RealTimeAnalyzer:
                     score['max_avg_ratio'], score['p99_avg_ratio'],
                     score['jitter_score'], score['std_dev_score'], score['cv_score'],
                     score['ratio_score'], score['p99_score'], score['overall_score'],
-                    score['rt_grade']
+                    score['rt_grade'],
+                    data.get('warmup_iterations', ''),
+                    data.get('warmup_converged', ''),
+                    data.get('cold_first', ''),
+                    data.get('cold_max', ''),
+                    data.get('cold_median', ''),
+                    data.get('steady_median', ''),
+                    data.get('freq_min_khz', ''),
+                    data.get('eff_freq_min_mhz', ''),
+                    data.get('temp_max_mc', ''),
+                    data.get('throttle_events', ''),
+                    data.get('freq_dip', ''),
+                    data.get('throttled', '')
                 ]
                 rows.append(row)
         
@@ -337,19 +561,142 @@ class RealTimeAnalyzer:
         print(f"✓ Visualization chart saved to: {output_file}")
         
         return output_file
+    
+    def create_distribution_visualization(self, output_dir: str = "."):
+        """创建延迟分布图 (直方图、CCDF、时间序列)"""
+        if not HAS_MATPLOTLIB:
+            raise ImportError("matplotlib not installed, cannot generate visualization chart")
+        
+        plotter = DistributionPlotter(self.cpu_model)
+        plotter.add_run(self.histograms, self.series, self.warmup_samples)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = os.path.join(output_dir, f"rt_distribution_{timestamp}.png")
+        plotter.create_warmup_visualization(
+            self.test_cases, os.path.join(output_dir, f"rt_warmup_{timestamp}.png"))
+        return plotter.create_distribution_visualization(self.test_cases, output_file)
+
+class AnalysisCache:
+    """以输入文件内容哈希为键的解析结果缓存
+
+    每个运行文件 (及其遥测文件) 解析后的记录以 gzip JSON 保存在实验目录下，
+    键包含 ANALYZER_VERSION，解析格式变化时旧缓存自动失效。
+    总大小超过上限时按最近使用时间淘汰。
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def key_for(filename: str) -> str:
+        """运行文件和其引用的遥测文件内容的 SHA-256"""
+        import hashlib
+        
+        digest = hashlib.sha256(ANALYZER_VERSION.encode())
+        with open(filename, 'rb') as f:
+            content = f.read()
+        digest.update(content)
+        
+        telemetry_path = RealTimeAnalyzer.resolve_telemetry_path(content.decode(errors='replace'), filename)
+        if telemetry_path:
+            with open(telemetry_path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+    
+    def get(self, key: str):
+        import gzip
+        import json
+        
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # 条目损坏 (截断的 gzip 会抛出 EOFError)，删除后按未命中处理，由调用方重新解析
+            self.discard(key)
+            self.misses += 1
+            return None
+        os.utime(path)  # 记录最近使用时间，用于淘汰
+        self.hits += 1
+        return record
+    
+    def discard(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def reject(self, key: str):
+        """get() 返回的记录无法加载时调用：删除条目并把这次命中改记为未命中"""
+        self.discard(key)
+        self.hits -= 1
+        self.misses += 1
+    
+    def put(self, key: str, record: Dict):
+        import gzip
+        import json
+        
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(record, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self._evict()
+    
+    def _evict(self):
+        """超过大小上限时删除最久未使用的条目"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.json.gz'):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
 
 class MultiRunAnalyzer:
-    def __init__(self):
+    def __init__(self, exclude_throttled: bool = False, use_cache: bool = True,
+                 cache_max_bytes: int = 64 * 1024 * 1024):
         self.test_cases = [
             "Pure Computation",
             "Regular Branch Pattern", 
             "Pseudo-Random Branch Pattern",
             "Nested Branch Pattern",
             "Memory + Branch Mixed",
-            "High-Frequency Branches"
+            "High-Frequency Branches",
+            "Syscall getppid",
+            "vDSO clock_gettime",
+            "Page Fault (Fresh mmap)",
+            "Page Fault (Prefaulted)",
+            "Timer Wakeup Latency",
+            "Timer Wakeup Latency (SCHED_FIFO)"
         ]
         self.all_runs_data = []  # 存储所有运行的数据
+        self.run_environments = []  # 每次运行的环境标签，与 all_runs_data 对应
+        self.run_histograms = []  # 每次运行的直方图，与 all_runs_data 对应
+        self.run_series = []      # 每次运行的时间序列，与 all_runs_data 对应
+        self.run_warmup_samples = []  # 每次运行的预热样本，与 all_runs_data 对应
+        self.exclude_throttled = exclude_throttled  # 是否剔除降频期间的测试结果
+        self.throttled_counts = {}  # test_case -> 降频的运行次数
+        self.use_cache = use_cache  # 是否使用 <实验目录>/.analysis_cache
+        self.cache_max_bytes = cache_max_bytes
         self.statistics = {}     # 存储统计数据
+        self.environment_statistics = {}  # 按运行环境分组的统计数据
         self.cpu_model = self._get_cpu_model()
     
     def _get_cpu_model(self) -> str:
@@ -393,15 +740,44 @@ class MultiRunAnalyzer:
         result_files.sort()  # 按文件名排序
         print(f"Found {len(result_files)} run result files")
         
-        # 分析每个运行结果
+        cache = None
+        if self.use_cache:
+            cache = AnalysisCache(os.path.join(multi_run_dir, ".analysis_cache"), self.cache_max_bytes)
+        
+        # 分析每个运行结果，内容未变的文件直接使用缓存的解析记录
         for i, file_path in enumerate(result_files, 1):
-            print(f"Analyzing run {i}/{len(result_files)}: {os.path.basename(file_path)}")
-            
             analyzer = RealTimeAnalyzer()
             try:
-                results = analyzer.parse_benchmark_output(file_path)
+                key = cache.key_for(file_path) if cache else None
+                record = cache.get(key) if cache else None
+                if record is not None:
+                    try:
+                        results = analyzer.load_record(record)
+                    except (KeyError, TypeError, ValueError, AttributeError):
+                        # 记录结构不完整，丢弃并重新解析
+                        cache.reject(key)
+                        analyzer = RealTimeAnalyzer()
+                        record = None
+                if record is None:
+                    print(f"Analyzing run {i}/{len(result_files)}: {os.path.basename(file_path)}")
+                    results = analyzer.parse_benchmark_output(file_path)
+                    if cache and results:
+                        cache.put(key, analyzer.to_record())
                 if results:
+                    for test_name, data in list(results.items()):
+                        if data.get('throttled'):
+                            self.throttled_counts[test_name] = self.throttled_counts.get(test_name, 0) + 1
+                            if self.exclude_throttled:
+                                # 分布图和预热图的数据也一并剔除
+                                del results[test_name]
+                                analyzer.histograms.pop(test_name, None)
+                                analyzer.series.pop(test_name, None)
+                                analyzer.warmup_samples.pop(test_name, None)
                     self.all_runs_data.append(results)
+                    self.run_environments.append(analyzer.environment_label)
+                    self.run_histograms.append(analyzer.histograms)
+                    self.run_series.append(analyzer.series)
+                    self.run_warmup_samples.append(analyzer.warmup_samples)
                 else:
                     print(f"Warning: Failed to parse {file_path}")
             except Exception as e:
@@ -411,27 +787,44 @@ class MultiRunAnalyzer:
             raise ValueError("No valid run data found")
         
         print(f"Successfully analyzed {len(self.all_runs_data)} runs")
+        if cache:
+            print(f"Analysis cache: {cache.hits} cached, {cache.misses} parsed")
         
         # 计算统计数据
-        self._calculate_statistics()
+        self.statistics = self._calculate_statistics(self.all_runs_data)
+        
+        # 运行环境不一致时，按环境分组分别统计
+        for env_label, runs in self.group_runs_by_environment().items():
+            self.environment_statistics[env_label] = self._calculate_statistics(runs)
         return self.statistics
     
-    def _calculate_statistics(self):
+    def group_runs_by_environment(self) -> Dict[str, List[Dict]]:
+        """按运行环境标签分组"""
+        groups = {}
+        for env_label, run_data in zip(self.run_environments, self.all_runs_data):
+            groups.setdefault(env_label, []).append(run_data)
+        return groups
+    
+    def _calculate_statistics(self, runs: List[Dict]) -> Dict:
         """计算多次运行的统计数据"""
         import numpy as np
         
+        statistics = {}
+        
         # 为每个测试用例计算统计数据
         for test_case in self.test_cases:
-            if test_case not in self.all_runs_data[0]:
+            if not any(test_case in run_data for run_data in runs):
                 continue
             
             # 收集该测试用例在所有运行中的数据
-            metrics = ['min', 'max', 'avg', 'jitter', 'std_dev', 'p95', 'p99', 'cv']
+            metrics = ['min', 'max', 'avg', 'jitter', 'std_dev', 'p95', 'p99', 'cv',
+                       'warmup_iterations', 'cold_first', 'cold_max', 'cold_median', 'steady_median',
+                       'freq_avg_khz', 'eff_freq_min_mhz', 'temp_max_mc']
             test_stats = {}
             
             for metric in metrics:
                 values = []
-                for run_data in self.all_runs_data:
+                for run_data in runs:
                     if test_case in run_data and metric in run_data[test_case]:
                         values.append(run_data[test_case][metric])
                 
@@ -465,7 +858,9 @@ class MultiRunAnalyzer:
                             test_stats[metric]['ci_lower'] = test_stats[metric]['mean'] - margin_error
                             test_stats[metric]['ci_upper'] = test_stats[metric]['mean'] + margin_error
             
-            self.statistics[test_case] = test_stats
+            statistics[test_case] = test_stats
+        
+        return statistics
     
     def export_statistics_to_csv(self, output_file: str, output_dir: str = None):
         """导出统计数据到CSV"""
@@ -477,15 +872,35 @@ class MultiRunAnalyzer:
             'Test_Case', 'Metric',
             'Mean', 'Std_Dev', 'Min', 'Max', 'Median',
             'Q25', 'Q75', 'CI_Lower', 'CI_Upper', 'Sample_Count',
-            'Coefficient_of_Variation'
+            'Coefficient_of_Variation', 'Environment'
         ]
         
+        # 单一环境时只输出一组；多个环境时先输出全部运行，再输出每个环境分组
+        if len(self.environment_statistics) == 1:
+            sections = list(self.environment_statistics.items())
+        else:
+            sections = [('all', self.statistics)] + list(self.environment_statistics.items())
+        
+        rows = []
+        for env_label, statistics in sections:
+            rows.extend(self._statistics_rows(statistics, env_label))
+        
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        
+        print(f"✓ Multi-run statistics exported to: {output_file}")
+        return output_file
+    
+    def _statistics_rows(self, statistics: Dict, env_label: str) -> List[List]:
+        """将一组统计数据转换为CSV行"""
         rows = []
         for test_case in self.test_cases:
-            if test_case not in self.statistics:
+            if test_case not in statistics:
                 continue
             
-            for metric, stats in self.statistics[test_case].items():
+            for metric, stats in statistics[test_case].items():
                 # 计算变异系数
                 cv = stats['std'] / stats['mean'] if stats['mean'] != 0 else 0
                 
@@ -501,17 +916,11 @@ class MultiRunAnalyzer:
                     round(stats.get('ci_lower', 0), 4),
                     round(stats.get('ci_upper', 0), 4),
                     stats['count'],
-                    round(cv, 6)
+                    round(cv, 6),
+                    env_label
                 ]
                 rows.append(row)
-        
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            writer.writerows(rows)
-        
-        print(f"✓ Multi-run statistics exported to: {output_file}")
-        return output_file
+        return rows
     
     def create_statistical_visualization(self, output_dir: str = "."):
         """创建统计可视化图表"""
@@ -534,14 +943,16 @@ class MultiRunAnalyzer:
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle(f'MicroBench Multi-Run Statistical Analysis on {self.cpu_model}', fontsize=18, fontweight='bold')
         
-        test_names = [name.replace(' ', '\n') for name in self.test_cases if name in self.statistics]
+        # 只绘制有数据的测试用例，保证各子图长度一致
+        plotted_cases = [name for name in self.test_cases if name in self.statistics]
+        test_names = [name.replace(' ', '\n') for name in plotted_cases]
         
         # 1. 平均执行时间及置信区间
         avg_means = []
         avg_cis_lower = []
         avg_cis_upper = []
         
-        for test_case in self.test_cases:
+        for test_case in plotted_cases:
             if test_case in self.statistics and 'avg' in self.statistics[test_case]:
                 stats = self.statistics[test_case]['avg']
                 avg_means.append(stats['mean'])
@@ -571,7 +982,7 @@ class MultiRunAnalyzer:
         cv_means = []
         cv_stds = []
         
-        for test_case in self.test_cases:
+        for test_case in plotted_cases:
             if test_case in self.statistics and 'cv' in self.statistics[test_case]:
                 stats = self.statistics[test_case]['cv']
                 cv_means.append(stats['mean'])
@@ -592,7 +1003,7 @@ class MultiRunAnalyzer:
         max_jitters = []
         jitter_cvs = []
         
-        for test_case in self.test_cases:
+        for test_case in plotted_cases:
             if test_case in self.statistics and 'jitter' in self.statistics[test_case]:
                 stats = self.statistics[test_case]['jitter']
                 # 最大 jitter：所有运行中的最坏情况
@@ -637,7 +1048,7 @@ class MultiRunAnalyzer:
         # 4. 运行之间的一致性（标准差的变异系数）
         consistency_scores = []
         
-        for test_case in self.test_cases:
+        for test_case in plotted_cases:
             if test_case in self.statistics and 'avg' in self.statistics[test_case]:
                 avg_stats = self.statistics[test_case]['avg']
                 # 一致性评分 = 1 / (1 + CV_of_averages)
@@ -667,6 +1078,21 @@ class MultiRunAnalyzer:
         
         return output_file
     
+    def create_distribution_visualization(self, output_dir: str = "."):
+        """创建所有运行叠加的延迟分布图 (直方图、CCDF、时间序列)"""
+        if not HAS_MATPLOTLIB:
+            raise ImportError("matplotlib not installed, cannot generate visualization chart")
+        
+        plotter = DistributionPlotter(self.cpu_model)
+        for histograms, series, warmup in zip(self.run_histograms, self.run_series, self.run_warmup_samples):
+            plotter.add_run(histograms, series, warmup)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = os.path.join(output_dir, f"multi_run_distribution_{timestamp}.png")
+        plotter.create_warmup_visualization(
+            self.test_cases, os.path.join(output_dir, f"multi_run_warmup_{timestamp}.png"))
+        return plotter.create_distribution_visualization(self.test_cases, output_file)
+    
     def print_multi_run_summary(self):
         """打印多次运行的统计摘要"""
         print("\n" + "="*80)
@@ -695,6 +1121,440 @@ class MultiRunAnalyzer:
                 consistency = (1 / (1 + cv_of_avg)) * 100
                 
                 print(f"{test_case:<25} {avg_mean:.0f}±{avg_std:.0f}     {max_jitter:<12.0f} {cv_mean:.4f}    {consistency:.1f}%")
+        
+        # 降频统计
+        if self.throttled_counts:
+            action = "excluded" if self.exclude_throttled else "kept, use --exclude-throttled to drop"
+            print(f"\nThrottled test runs ({action}):")
+            for test_case in self.test_cases:
+                if test_case in self.throttled_counts:
+                    print(f"  {test_case:<35} {self.throttled_counts[test_case]}/{len(self.all_runs_data)} runs")
+        
+        # 运行环境分组
+        groups = self.group_runs_by_environment()
+        print(f"\nEnvironments ({len(groups)}):")
+        for group_index, (env_label, runs) in enumerate(groups.items(), 1):
+            print(f"  #{group_index} [{len(runs)} runs] {env_label}")
+        
+        if len(groups) > 1:
+            print(f"\n{'Test Case':<25} {'Environment':<8} {'Avg±Std':<15} {'CV':<10}")
+            print("-" * 80)
+            for test_case in self.test_cases:
+                for group_index, (env_label, statistics) in enumerate(self.environment_statistics.items(), 1):
+                    if test_case not in statistics:
+                        continue
+                    avg_stats = statistics[test_case].get('avg', {})
+                    cv_stats = statistics[test_case].get('cv', {})
+                    if avg_stats and cv_stats:
+                        print(f"{test_case:<25} #{group_index:<7} {avg_stats['mean']:.0f}±{avg_stats['std']:.0f}     {cv_stats['mean']:.4f}")
+
+class DistributionPlotter:
+    """根据 microbench 输出的直方图和时间序列绘制分布图
+
+    直方图在基准程序中已经分箱 (与 common.c 的 hist_bin() 一致)，
+    这里只对箱计数做向量化合并，绘图开销与样本数量无关。
+    """
+    
+    def __init__(self, cpu_model: str = "Unknown CPU"):
+        self.cpu_model = cpu_model
+        self.histograms = {}  # test_case -> [每次运行的箱计数数组]
+        self.series = {}      # test_case -> [(window, avg数组, max数组)]
+        self.warmup = {}      # test_case -> [预热样本数组]
+        self.edges = self.histogram_bin_edges()
+    
+    @staticmethod
+    def histogram_bin_index(values) -> 'np.ndarray':
+        """对数线性分箱下标 (向量化，与 common.c hist_bin() 相同)"""
+        v = np.asarray(values, dtype=np.uint64)
+        _, exponent = np.frexp(v.astype(np.float64))
+        shift = np.maximum(exponent.astype(np.int64) - 1 - HIST_SUB_BITS, 0)
+        sub = (v >> shift.astype(np.uint64)) & np.uint64((1 << HIST_SUB_BITS) - 1)
+        binned = ((shift + 1) << HIST_SUB_BITS) + sub.astype(np.int64)
+        return np.where(v < (1 << HIST_SUB_BITS), v.astype(np.int64), binned)
+    
+    @staticmethod
+    def histogram_bin_edges() -> 'np.ndarray':
+        """所有箱的边界 (HIST_BINS + 1 个)"""
+        bins = np.arange(HIST_BINS)
+        shift = np.maximum((bins >> HIST_SUB_BITS) - 1, 0)
+        sub = bins & ((1 << HIST_SUB_BITS) - 1)
+        lower = np.where(bins < (1 << HIST_SUB_BITS), bins,
+                         ((1 << HIST_SUB_BITS) + sub) * np.power(2.0, shift))
+        return np.append(lower.astype(np.float64), 2.0 ** 64)
+    
+    def add_run(self, histograms: Dict, series: Dict, warmup_samples: Dict = None):
+        """加入一次运行解析得到的直方图 {lower: count}、时间序列和预热样本"""
+        for test_case, bins in histograms.items():
+            counts = np.zeros(HIST_BINS, dtype=np.int64)
+            if bins:
+                np.add.at(counts, self.histogram_bin_index(list(bins.keys())), list(bins.values()))
+            self.histograms.setdefault(test_case, []).append(counts)
+        for test_case, data in series.items():
+            self.series.setdefault(test_case, []).append(data)
+        for test_case, samples in (warmup_samples or {}).items():
+            self.warmup.setdefault(test_case, []).append(np.asarray(samples, dtype=np.float64))
+    
+    def create_warmup_visualization(self, test_cases: List[str], output_file: str,
+                                    window: int = WARMUP_WINDOW):
+        """预热收敛曲线：每个窗口的中位数相对稳态值的比例"""
+        if not HAS_MATPLOTLIB:
+            raise ImportError("matplotlib not installed, cannot generate visualization chart")
+        
+        test_cases = [name for name in test_cases if name in self.warmup]
+        if not test_cases:
+            return None
+        
+        fig, ax = plt.subplots(figsize=(14, 7))
+        fig.suptitle(f'MicroBench Warmup Convergence on {self.cpu_model}', fontsize=16, fontweight='bold')
+        colors = plt.cm.tab20(np.linspace(0, 1, max(len(test_cases), 2)))
+        
+        for color, test_case in zip(colors, test_cases):
+            for i, samples in enumerate(self.warmup[test_case]):
+                n_windows = len(samples) // window
+                if n_windows == 0:
+                    continue
+                # 一次 reshape 得到所有窗口的中位数
+                medians = np.median(samples[:n_windows * window].reshape(n_windows, window), axis=1)
+                x = (np.arange(n_windows) + 1) * window
+                ax.plot(x, medians / medians[-1], color=color, marker='.', alpha=0.7,
+                        label=test_case if i == 0 else None)
+        
+        ax.axhline(1.0, color='black', linewidth=1)
+        ax.axhspan(1 - WARMUP_TOLERANCE, 1 + WARMUP_TOLERANCE, color='grey', alpha=0.15)
+        ax.set_xlabel('Warmup iterations')
+        ax.set_ylabel('Window median / steady-state median')
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='center left', bbox_to_anchor=(1.01, 0.5), fontsize=9)
+        
+        plt.tight_layout()
+        plt.savefig(output_file, dpi=200, bbox_inches='tight')
+        plt.close(fig)
+        print(f"✓ Warmup convergence visualization saved to: {output_file}")
+        
+        return output_file
+    
+    def create_distribution_visualization(self, test_cases: List[str], output_file: str):
+        """直方图、CCDF (超越概率) 和时间序列，所有运行和测试用例叠加绘制"""
+        if not HAS_MATPLOTLIB:
+            raise ImportError("matplotlib not installed, cannot generate visualization chart")
+        
+        test_cases = [name for name in test_cases if name in self.histograms]
+        if not test_cases:
+            print("Note: no histogram data in results, skipping distribution plots")
+            return None
+        
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        plt.rcParams['font.size'] = 11
+        
+        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(14, 18))
+        fig.suptitle(f'MicroBench Latency Distributions on {self.cpu_model}', fontsize=16, fontweight='bold')
+        
+        colors = plt.cm.tab20(np.linspace(0, 1, max(len(test_cases), 2)))
+        # 对数坐标下 0 值无法显示
+        edges = np.maximum(self.edges, 0.5)
+        
+        for color, test_case in zip(colors, test_cases):
+            runs = np.vstack(self.histograms[test_case])
+            merged = runs.sum(axis=0)
+            nonzero = np.nonzero(merged)[0]
+            if len(nonzero) == 0:
+                continue
+            lo, hi = nonzero[0], nonzero[-1] + 1
+            
+            # 1. 直方图：每次运行细线，合并结果粗线
+            if len(runs) > 1:
+                for counts in runs:
+                    ax1.stairs(counts[lo:hi] / counts.sum(), edges[lo:hi + 1], color=color, alpha=0.25)
+            ax1.stairs(merged[lo:hi] / merged.sum(), edges[lo:hi + 1], color=color, linewidth=2, label=test_case)
+            
+            # 2. CCDF：P(X > x)，x 取箱上界
+            curves = [(counts, 1, 0.25, None) for counts in runs] if len(runs) > 1 else []
+            curves.append((merged, 2, 1.0, test_case))
+            for counts, width, alpha, label in curves:
+                exceedance = 1.0 - np.cumsum(counts[lo:hi]) / counts.sum()
+                mask = exceedance > 0
+                ax2.step(edges[lo + 1:hi + 1][mask], exceedance[mask], where='post', color=color,
+                         linewidth=width, alpha=alpha, label=label)
+            
+            # 3. 时间序列：每个窗口的最大值 (实线) 和平均值 (虚线)
+            for i, (window, avg, peak) in enumerate(self.series.get(test_case, [])):
+                x = np.arange(len(peak)) * window
+                ax3.plot(x, peak, color=color, alpha=0.6, linewidth=1, label=test_case if i == 0 else None)
+                ax3.plot(x, avg, color=color, alpha=0.6, linewidth=1, linestyle='--')
+        
+        ax1.set_title('Latency Histogram (fraction of samples per bin)', fontweight='bold')
+        ax1.set_xscale('log')
+        ax1.set_xlabel('Latency (CPU cycles; ns for timer tests)')
+        ax1.set_ylabel('Fraction')
+        
+        ax2.set_title('Exceedance Probability (CCDF)', fontweight='bold')
+        ax2.set_xscale('log')
+        ax2.set_yscale('log')
+        ax2.set_xlabel('Latency (CPU cycles; ns for timer tests)')
+        ax2.set_ylabel('P(latency > x)')
+        
+        ax3.set_title('Per-Window Max (solid) and Avg (dashed) over Sample Index', fontweight='bold')
+        ax3.set_yscale('log')
+        ax3.set_xlabel('Sample index')
+        ax3.set_ylabel('Latency')
+        
+        for ax in (ax1, ax2, ax3):
+            ax.grid(True, which='both', alpha=0.3)
+            ax.legend(loc='center left', bbox_to_anchor=(1.01, 0.5), fontsize=9)
+        
+        plt.tight_layout()
+        plt.savefig(output_file, dpi=200, bbox_inches='tight')
+        plt.close(fig)
+        print(f"✓ Distribution visualization saved to: {output_file}")
+        
+        return output_file
+
+class VariantComparisonAnalyzer:
+    """对比同一组测试在不同编译器/编译参数变体下的延迟分布"""
+    
+    def __init__(self, bin_dir: str = "../bin", use_cache: bool = True,
+                 cache_max_bytes: int = 64 * 1024 * 1024):
+        self.bin_dir = bin_dir
+        self.use_cache = use_cache
+        self.cache_max_bytes = cache_max_bytes
+        # 测试用例 -> 被测量的 kernel 函数，用于反汇编检查
+        self.test_functions = {
+            "Pure Computation": "pure_computation_kernel",
+            "Regular Branch Pattern": "regular_branches_kernel",
+            "Pseudo-Random Branch Pattern": "pseudo_random_branches_kernel",
+            "Nested Branch Pattern": "nested_branches_kernel",
+            "Memory + Branch Mixed": "memory_branch_mixed_kernel",
+            "High-Frequency Branches": "high_frequency_branches_kernel",
+        }
+        # 这些用例测量的就是分支预测，分支被编译为条件选择后测试即失去意义
+        self.branch_test_cases = [
+            "Regular Branch Pattern",
+            "Pseudo-Random Branch Pattern",
+            "Nested Branch Pattern",
+            "Memory + Branch Mixed",
+            "High-Frequency Branches",
+        ]
+        self.variants = {}          # tag -> MultiRunAnalyzer
+        self.branch_profiles = {}   # tag -> {function: {'cond_branches', 'selects'}}
+        self.cpu_model = MultiRunAnalyzer().cpu_model
+    
+    def analyze_variants(self, matrix_dir: str) -> Dict:
+        """分析矩阵目录下每个变体子目录"""
+        variant_dirs = sorted(
+            d for d in os.listdir(matrix_dir) if os.path.isdir(os.path.join(matrix_dir, d))
+        )
+        
+        for tag in variant_dirs:
+            print(f"\n--- Variant {tag} ---")
+            analyzer = MultiRunAnalyzer(use_cache=self.use_cache, cache_max_bytes=self.cache_max_bytes)
+            try:
+                analyzer.analyze_multi_runs(os.path.join(matrix_dir, tag))
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Warning: skipping variant {tag}: {e}")
+                continue
+            self.variants[tag] = analyzer
+            self.branch_profiles[tag] = self._disassemble_branches(
+                os.path.join(self.bin_dir, f"microbench-{tag}")
+            )
+        
+        if not self.variants:
+            raise ValueError(f"No variant data found in {matrix_dir}")
+        
+        return self.variants
+    
+    def _disassemble_branches(self, binary: str) -> Dict:
+        """统计每个测试函数中的条件跳转和无分支条件选择指令 (cmov/setcc/csel)"""
+        import shutil
+        import subprocess
+        
+        if not os.path.exists(binary) or not shutil.which('objdump'):
+            print(f"Warning: cannot disassemble {binary}, skipping cmov check")
+            return {}
+        
+        try:
+            result = subprocess.run(['objdump', '-d', '--no-show-raw-insn', binary],
+                                    capture_output=True, text=True, timeout=60)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            print(f"Warning: objdump failed on {binary}: {e}")
+            return {}
+        
+        wanted = set(self.test_functions.values())
+        select_pattern = re.compile(r'^(cmov\w+|set\w+|csel|csinc|csinv|csneg|cset|csetm)$')
+        branch_pattern = re.compile(r'^(j(?!mp)\w+|b\.\w+|cbn?z|tbn?z)$')
+        
+        profiles = {}
+        current = None
+        for line in result.stdout.splitlines():
+            header = re.match(r'^[0-9a-f]+ <([\w.]+)>:$', line)
+            if header:
+                name = header.group(1).split('.')[0]
+                current = name if name in wanted else None
+                if current:
+                    profiles.setdefault(current, {'cond_branches': 0, 'selects': 0})
+                continue
+            if not current or '\t' not in line:
+                continue
+            fields = line.split('\t')
+            if len(fields) < 2 or not fields[1].split():
+                continue
+            mnemonic = fields[1].split()[0]
+            if select_pattern.match(mnemonic):
+                profiles[current]['selects'] += 1
+            elif branch_pattern.match(mnemonic):
+                profiles[current]['cond_branches'] += 1
+        
+        return profiles
+    
+    def _baseline_profile(self, tag: str, function: str):
+        """同一编译器 -O0 变体中该函数的分支统计，没有则取任一 -O0 变体"""
+        compiler = tag.split('-')[0]
+        baselines = [t for t in self.branch_profiles if t.endswith('-O0') and t != tag]
+        baselines.sort(key=lambda t: t.split('-')[0] != compiler)
+        for baseline in baselines:
+            profile = self.branch_profiles[baseline].get(function)
+            if profile:
+                return profile
+        return None
+    
+    def branch_conversion(self, tag: str, test_case: str) -> str:
+        """分支用例中的分支被编译器改写的方式，未改写时返回空字符串
+        
+        selects: 编译为 cmov/setcc/csel 等条件选择
+        eliminated: 条件跳转被完全消除 (展开或常量折叠)
+        reduced: 条件跳转少于 -O0 基线 (部分分支被改写为算术)
+        """
+        if test_case not in self.branch_test_cases:
+            return ''
+        function = self.test_functions.get(test_case)
+        profile = self.branch_profiles.get(tag, {}).get(function)
+        if not profile:
+            return ''
+        if profile['selects'] > 0:
+            return 'selects'
+        if profile['cond_branches'] == 0:
+            return 'eliminated'
+        baseline = self._baseline_profile(tag, function)
+        if baseline and profile['cond_branches'] < baseline['cond_branches']:
+            return 'reduced'
+        return ''
+    
+    def is_branch_converted(self, tag: str, test_case: str) -> bool:
+        """判断该变体是否改写了分支用例中的分支"""
+        return bool(self.branch_conversion(tag, test_case))
+    
+    def _comparison_rows(self) -> List[List]:
+        rows = []
+        test_cases = MultiRunAnalyzer().test_cases
+        for test_case in test_cases:
+            for tag, analyzer in self.variants.items():
+                stats = analyzer.statistics.get(test_case)
+                if not stats:
+                    continue
+                profile = self.branch_profiles.get(tag, {}).get(self.test_functions.get(test_case), {})
+                rows.append([
+                    test_case, tag, stats['avg']['count'],
+                    round(stats['avg']['mean'], 2),
+                    round(stats['p95']['mean'], 2),
+                    round(stats['p99']['mean'], 2),
+                    round(stats['max']['mean'], 2),
+                    round(stats['cv']['mean'], 6),
+                    stats['jitter']['max'],
+                    profile.get('cond_branches', ''),
+                    profile.get('selects', ''),
+                    self.branch_conversion(tag, test_case)
+                ])
+        return rows
+    
+    def export_comparison_to_csv(self, output_file: str, output_dir: str = None):
+        """导出各变体的对比数据到CSV"""
+        if output_dir:
+            filename = os.path.basename(output_file)
+            output_file = os.path.join(output_dir, filename)
+        
+        headers = [
+            'Test_Case', 'Variant', 'Runs',
+            'Avg_Mean', 'P95_Mean', 'P99_Mean', 'Max_Mean', 'CV_Mean', 'Jitter_Max',
+            'Cond_Branches', 'Branchless_Selects', 'Branch_Converted'
+        ]
+        
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(self._comparison_rows())
+        
+        print(f"✓ Variant comparison exported to: {output_file}")
+        return output_file
+    
+    def print_comparison_summary(self):
+        """打印各变体对比摘要"""
+        print("\n" + "="*80)
+        print(f"    Compiler Variant Comparison ({len(self.variants)} variants)")
+        print("="*80)
+        
+        print(f"{'Test Case':<30} {'Variant':<18} {'Avg':<10} {'P99':<10} {'CV':<10} {'Jcc/Sel':<9}")
+        print("-" * 80)
+        
+        warnings = []
+        for row in self._comparison_rows():
+            test_case, tag, _, avg, _, p99, _, cv, _, branches, selects, converted = row
+            profile = f"{branches}/{selects}" if branches != '' else "n/a"
+            flag = " !" if converted else ""
+            print(f"{test_case:<30} {tag:<18} {avg:<10.0f} {p99:<10.0f} {cv:<10.4f} {profile:<9}{flag}")
+            if converted:
+                warnings.append((test_case, tag, converted))
+        
+        if warnings:
+            print("\nWarning: branches compiled to conditional selects (cmov/setcc/csel), removed,")
+            print("or reduced below the -O0 baseline; these results do not measure branch prediction:")
+            for test_case, tag, converted in warnings:
+                print(f"  - {test_case} [{tag}]: {converted}")
+    
+    def create_comparison_visualization(self, output_dir: str = "."):
+        """每个测试用例一个子图，对比各变体的 min/avg/p95/p99/max"""
+        if not HAS_MATPLOTLIB:
+            raise ImportError("matplotlib not installed, cannot generate visualization chart")
+        
+        import math
+        
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        plt.rcParams['font.size'] = 10
+        
+        test_cases = [name for name in MultiRunAnalyzer().test_cases
+                      if any(name in analyzer.statistics for analyzer in self.variants.values())]
+        tags = list(self.variants.keys())
+        
+        ncols = 3
+        nrows = math.ceil(len(test_cases) / ncols)
+        fig, axes = plt.subplots(nrows, ncols, figsize=(6 * ncols, 4.5 * nrows), squeeze=False)
+        fig.suptitle(f'MicroBench Compiler Variant Comparison on {self.cpu_model}', fontsize=16, fontweight='bold')
+        
+        for ax, test_case in zip(axes.flat, test_cases):
+            for x, tag in enumerate(tags):
+                stats = self.variants[tag].statistics.get(test_case)
+                if not stats:
+                    continue
+                color = 'red' if self.is_branch_converted(tag, test_case) else 'navy'
+                # min-max 竖线，p95-p99 粗线段，avg 圆点
+                ax.vlines(x, stats['min']['mean'], stats['max']['mean'], color=color, alpha=0.4)
+                ax.vlines(x, stats['p95']['mean'], stats['p99']['mean'], color=color, linewidth=6)
+                ax.plot(x, stats['avg']['mean'], 'o', color='white', markeredgecolor=color)
+            ax.set_title(test_case, fontweight='bold')
+            ax.set_yscale('log')
+            ax.set_xticks(range(len(tags)))
+            ax.set_xticklabels(tags, rotation=45, ha='right')
+            ax.grid(True, alpha=0.3)
+        
+        for ax in list(axes.flat)[len(test_cases):]:
+            ax.set_visible(False)
+        
+        plt.tight_layout()
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = os.path.join(output_dir, f"variant_comparison_{timestamp}.png")
+        plt.savefig(output_file, dpi=200, bbox_inches='tight')
+        print(f"✓ Variant comparison visualization saved to: {output_file}")
+        
+        return output_file
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze MicroBench real-time test results')
@@ -702,11 +1562,48 @@ def main():
     parser.add_argument('-o', '--output', default='rt_analysis.csv', help='output CSV file name')
     parser.add_argument('--no-plot', action='store_true', help='do not generate visualization chart')
     parser.add_argument('--multi-run', type=str, help='directory containing multiple run result files')
+    parser.add_argument('--compare-variants', type=str, help='directory with one multi-run subdirectory per build variant')
+    parser.add_argument('--exclude-throttled', action='store_true',
+                        help='drop test results whose telemetry shows throttling or frequency drops (multi-run)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='re-parse every run file instead of using <dir>/.analysis_cache')
+    parser.add_argument('--cache-max-mb', type=int, default=64, help='analysis cache size limit in MB (default: 64)')
+    parser.add_argument('--bin-dir', default='../bin', help='directory holding microbench-<variant> binaries (for cmov check)')
     
     args = parser.parse_args()
     
-    # 检查是多次运行分析还是单次运行分析
-    if args.multi_run:
+    # 检查是变体对比、多次运行分析还是单次运行分析
+    if args.compare_variants:
+        if not os.path.isdir(args.compare_variants):
+            print(f"Error: variant directory '{args.compare_variants}' does not exist")
+            sys.exit(1)
+        
+        print(f"Comparing build variants in directory: {args.compare_variants}")
+        
+        variant_analyzer = VariantComparisonAnalyzer(args.bin_dir, use_cache=not args.no_cache,
+                                                     cache_max_bytes=args.cache_max_mb * 1024 * 1024)
+        
+        try:
+            variant_analyzer.analyze_variants(args.compare_variants)
+            variant_analyzer.export_comparison_to_csv(args.output, args.compare_variants)
+            variant_analyzer.print_comparison_summary()
+            
+            if not args.no_plot:
+                try:
+                    variant_analyzer.create_comparison_visualization(args.compare_variants)
+                except ImportError:
+                    print("Warning: matplotlib not installed, skipping visualization chart generation")
+                    print("Install command: pip install matplotlib numpy")
+                except Exception as e:
+                    print(f"Visualization generation failed: {e}")
+            
+            print(f"\n✓ Variant comparison completed. All files saved to: {args.compare_variants}")
+            
+        except Exception as e:
+            print(f"Error occurred during variant comparison: {e}")
+            sys.exit(1)
+    
+    elif args.multi_run:
         # 多次运行分析
         if not os.path.exists(args.multi_run):
             print(f"Error: multi-run directory '{args.multi_run}' does not exist")
@@ -714,7 +1611,9 @@ def main():
         
         print(f"Analyzing multiple runs in directory: {args.multi_run}")
         
-        multi_analyzer = MultiRunAnalyzer()
+        multi_analyzer = MultiRunAnalyzer(exclude_throttled=args.exclude_throttled,
+                                          use_cache=not args.no_cache,
+                                          cache_max_bytes=args.cache_max_mb * 1024 * 1024)
         
         try:
             # 分析多次运行
@@ -734,6 +1633,7 @@ def main():
             if not args.no_plot:
                 try:
                     chart_file = multi_analyzer.create_statistical_visualization(args.multi_run)
+                    dist_file = multi_analyzer.create_distribution_visualization(args.multi_run)
                 except ImportError:
                     print("Warning: matplotlib not installed, skipping visualization chart generation")
                     print("Install command: pip install matplotlib numpy")
@@ -798,6 +1698,7 @@ def main():
                 f.write(f"  - Analysis: {os.path.basename(csv_output)}\n")
                 if not args.no_plot:
                     f.write(f"  - Visualization: rt_analysis_{timestamp}.png\n")
+                    f.write(f"  - Distributions: rt_distribution_{timestamp}.png\n")
                 f.write(f"\nExperiment Directory: {experiment_dir}\n")
             
             analyzer.print_summary()
@@ -805,6 +1706,7 @@ def main():
             if not args.no_plot:
                 try:
                     chart_file = analyzer.create_visualization(experiment_dir)
+                    dist_file = analyzer.create_distribution_visualization(experiment_dir)
                 except ImportError as e:
                     print("Warning: matplotlib not installed, skipping visualization chart generation")
                     print("Install command: pip install matplotlib")
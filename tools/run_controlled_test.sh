@@ -6,6 +6,8 @@ echo
 # default configs
 NUM_RUNS=20  # default 20 times
 SLEEP_BETWEEN_RUNS=5  # default 5 seconds
+RT_ENV=true  # let microbench set up and restore the real-time environment
+DROP_CACHES=false  # drop page cache before the runs (root only)
 
 
 while [[ $# -gt 0 ]]; do
@@ -18,11 +20,21 @@ while [[ $# -gt 0 ]]; do
             SLEEP_BETWEEN_RUNS="$2"
             shift 2
             ;;
+        --no-rt-env)
+            RT_ENV=false
+            shift
+            ;;
+        --drop-caches)
+            DROP_CACHES=true
+            shift
+            ;;
         -h|--help)
             echo "Usage: $0 [OPTIONS]"
             echo "Options:"
             echo "  -n, --num-runs NUM     Number of test runs (default: 20)"
             echo "  -s, --sleep SECONDS    Sleep time between runs (default: 5)"
+            echo "  --no-rt-env            Run microbench without its real-time environment setup"
+            echo "  --drop-caches          Drop the page cache before the runs (requires root)"
             echo "  -h, --help             Show this help message"
             exit 0
             ;;
@@ -53,33 +65,34 @@ echo "CPU Frequency Strategy: $(cat /sys/devices/system/cpu/cpu0/cpufreq/scaling
 echo "Memory State: $(free -m | grep Mem:)"
 echo
 
-# 2. 设置CPU频率为性能模式（需要root）
-if [ "$HAVE_ROOT" = true ]; then
-    echo "Setting CPU to performance mode..."
-    for cpu in /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor; do
-        echo performance > "$cpu" 2>/dev/null
-    done
-    echo "✓ CPU Frequency Strategy is set to performance"
+# 2. 实时环境由 microbench 自行设置并在退出时精确恢复，生效的设置写入结果头
+MICROBENCH_ARGS=()
+if [ "$RT_ENV" = true ]; then
+    MICROBENCH_ARGS=(--mlockall --prefault --no-thp --cpu 0)
+    if [ "$HAVE_ROOT" = true ]; then
+        MICROBENCH_ARGS+=(--fifo 80 --dma-latency 0 --governor performance)
+    else
+        echo "⚠ Skipping SCHED_FIFO, cpu_dma_latency and governor settings (requires root permissions)"
+    fi
+    echo "✓ microbench environment options: ${MICROBENCH_ARGS[*]}"
 else
-    echo "⚠ Skipping CPU frequency setting (requires root permissions)"
+    echo "⚠ Real-time environment setup disabled"
 fi
 
-# 3. 设置进程优先级
-echo "Setting high priority..."
-renice -n -10 $$ 2>/dev/null && echo "✓ Process priority has been increased" || echo "⚠ Unable to increase process priority"
-
-# 4. 清理系统缓存（需要root）
-if [ "$HAVE_ROOT" = true ]; then
-    echo "Cleaning system cache..."
-    sync
-    echo 3 > /proc/sys/vm/drop_caches 2>/dev/null && echo "✓ System cache has been cleaned" || echo "⚠ Unable to clean system cache"
+# 3. 清理系统缓存（可选，需要root），结果记录在实验信息文件中
+CACHES_DROPPED=false
+if [ "$DROP_CACHES" = true ]; then
+    if [ "$HAVE_ROOT" = true ]; then
+        echo "Cleaning system cache..."
+        sync
+        echo 3 > /proc/sys/vm/drop_caches 2>/dev/null && CACHES_DROPPED=true
+        [ "$CACHES_DROPPED" = true ] && echo "✓ System cache has been cleaned" || echo "⚠ Unable to clean system cache"
+    else
+        echo "⚠ Skipping cache cleaning (requires root permissions)"
+    fi
 fi
 
-# 5. 设置CPU亲和性到单核
-echo "Setting CPU affinity to CPU0..."
-taskset -cp 0 $$ 2>/dev/null && echo "✓ CPU Affinity has been set" || echo "⚠ Unable to set CPU affinity"
-
-# 6. 预热CPU（避免频率调节影响）
+# 4. 预热CPU（避免频率调节影响）
 echo "CPU warming up..."
 python3 -c "
 import time
@@ -89,7 +102,7 @@ while time.time() - start < 2:
 print('✓ CPU warming up completed')
 "
 
-# 7. 运行多次基准测试
+# 5. 运行多次基准测试
 echo
 echo "=== Start Controlled Benchmark Test (${NUM_RUNS} runs) ==="
 
@@ -100,6 +113,14 @@ if [ ! -f "../bin/microbench" ]; then
     exit 1
 fi
 
+# 旧版 microbench 忽略命令行参数，结果中不会有 Environment:/Telemetry: 头
+# (检查帮助文本而不是运行它，旧版会直接开始测试)
+if ! grep -qaF -- "--telemetry" ../bin/microbench; then
+    echo "Error: ../bin/microbench is out of date and does not support the environment/telemetry options"
+    echo "Please rebuild it: cd ../src && make"
+    exit 1
+fi
+
 # 生成总时间戳和多次运行的实验目录
 TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
 MULTI_RUN_DIR="../result/multi_run_${TIMESTAMP}"
@@ -123,12 +144,9 @@ for i in $(seq 1 $NUM_RUNS); do
     
     echo "Running test $i..."
     
-    # 使用taskset确保在单核上运行
-    if command -v taskset >/dev/null 2>&1; then
-        taskset -c 0 ../bin/microbench > "$TEMP_RESULTS_FILE"
-    else
-        ../bin/microbench > "$TEMP_RESULTS_FILE"
-    fi
+    # 频率/温度遥测与结果文件放在一起，供分析工具关联或剔除降频样本
+    TELEMETRY_FILE="$MULTI_RUN_DIR/run_${i}_${RUN_TIMESTAMP}_telemetry.csv"
+    ../bin/microbench "${MICROBENCH_ARGS[@]}" --telemetry "$TELEMETRY_FILE" > "$TEMP_RESULTS_FILE"
     
     if [ $? -eq 0 ]; then
         echo "✓ Test $i completed"
@@ -136,7 +154,7 @@ for i in $(seq 1 $NUM_RUNS); do
         SUCCESS_COUNT=$((SUCCESS_COUNT + 1))
     else
         echo "✗ Test $i failed"
-        rm -f "$TEMP_RESULTS_FILE"
+        rm -f "$TEMP_RESULTS_FILE" "$TELEMETRY_FILE"
     fi
     
     # 在运行之间等待，除了最后一次
@@ -176,6 +194,8 @@ if [ $? -eq 0 ]; then
     echo "Successful Runs: $SUCCESS_COUNT" >> "$INFO_FILE"
     echo "Sleep Between Runs: ${SLEEP_BETWEEN_RUNS}s" >> "$INFO_FILE"
     echo "Root Permissions: $HAVE_ROOT" >> "$INFO_FILE"
+    echo "Microbench Options: ${MICROBENCH_ARGS[*]:-none}" >> "$INFO_FILE"
+    echo "Page Cache Dropped: $CACHES_DROPPED" >> "$INFO_FILE"
     echo >> "$INFO_FILE"
     echo "Individual Run Files:" >> "$INFO_FILE"
     for file in "${RESULT_FILES[@]}"; do
@@ -186,16 +206,6 @@ else
     exit 1
 fi
 
-# 8. 恢复系统设置（如果修改了）
-if [ "$HAVE_ROOT" = true ]; then
-    echo
-    echo "Restoring system settings..."
-    for cpu in /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor; do
-        echo powersave > "$cpu" 2>/dev/null
-    done
-    echo "✓ CPU frequency strategy has been restored to powersave"
-fi
-
 # echo
 # echo "=== 多次运行受控测试建议 ==="
 # echo "1. 已完成 $SUCCESS_COUNT 次运行，获得了统计显著的数据"
@@ -0,0 +1,107 @@
+#!/bin/bash
+
+echo "=== MicroBench Compiler Matrix Test ==="
+echo
+
+# default configs
+NUM_RUNS=5  # runs per variant
+SLEEP_BETWEEN_RUNS=2  # seconds
+MICROBENCH_ARGS=()
+
+
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        -n|--num-runs)
+            NUM_RUNS="$2"
+            shift 2
+            ;;
+        -s|--sleep)
+            SLEEP_BETWEEN_RUNS="$2"
+            shift 2
+            ;;
+        --)
+            shift
+            MICROBENCH_ARGS=("$@")
+            break
+            ;;
+        -h|--help)
+            echo "Usage: $0 [OPTIONS] [-- MICROBENCH_OPTIONS]"
+            echo "Options:"
+            echo "  -n, --num-runs NUM     Number of runs per variant (default: 5)"
+            echo "  -s, --sleep SECONDS    Sleep time between runs (default: 2)"
+            echo "  -h, --help             Show this help message"
+            echo "Options after -- are passed to every variant, e.g. -- --rt --cpu 2"
+            exit 0
+            ;;
+        *)
+            echo "Unknown option: $1"
+            echo "Use -h or --help for usage information"
+            exit 1
+            ;;
+    esac
+done
+
+# 1. 构建所有编译器/参数变体
+echo "Building variants..."
+(cd ../src && make matrix)
+if [ $? -ne 0 ]; then
+    echo "✗ Matrix build failed"
+    exit 1
+fi
+
+VARIANTS=()
+for bin in ../bin/microbench-*; do
+    [ -x "$bin" ] && VARIANTS+=("$(basename "$bin")")
+done
+
+if [ ${#VARIANTS[@]} -eq 0 ]; then
+    echo "✗ No variants were built"
+    exit 1
+fi
+
+echo "✓ Variants: ${VARIANTS[*]#microbench-}"
+echo
+
+# 2. 逐个变体运行，每个变体一个子目录，与 --multi-run 目录布局一致
+TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
+MATRIX_RUN_DIR="../result/matrix_${TIMESTAMP}"
+mkdir -p "$MATRIX_RUN_DIR"
+
+echo "Matrix experiment directory: $MATRIX_RUN_DIR"
+echo
+
+for variant in "${VARIANTS[@]}"; do
+    TAG="${variant#microbench-}"
+    VARIANT_DIR="$MATRIX_RUN_DIR/$TAG"
+    mkdir -p "$VARIANT_DIR"
+    
+    echo "=== Variant $TAG ==="
+    for i in $(seq 1 $NUM_RUNS); do
+        RUN_TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
+        RESULT_FILE="$VARIANT_DIR/run_${i}_${RUN_TIMESTAMP}.txt"
+        
+        if "../bin/$variant" "${MICROBENCH_ARGS[@]}" > "$RESULT_FILE"; then
+            echo "✓ Run $i/$NUM_RUNS completed"
+        else
+            echo "✗ Run $i/$NUM_RUNS failed"
+            rm -f "$RESULT_FILE"
+        fi
+        
+        if [ $i -lt $NUM_RUNS ]; then
+            sleep $SLEEP_BETWEEN_RUNS
+        fi
+    done
+    echo
+done
+
+# 3. 对比各变体的延迟分布并检查分支是否被编译为 cmov
+echo "=== Variant comparison ==="
+python3 analyze_results.py --compare-variants "$MATRIX_RUN_DIR" --bin-dir ../bin -o "variant_comparison_${TIMESTAMP}.csv"
+
+if [ $? -eq 0 ]; then
+    echo "✓ Variant comparison completed"
+    echo "Experiment data saved to: $MATRIX_RUN_DIR"
+else
+    echo "✗ Variant comparison failed"
+    exit 1
+fi